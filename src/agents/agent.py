@@ -1,4 +1,5 @@
 """Agent-based reasoning and planning"""
+import re
 from typing import List, Dict, Optional
 from enum import Enum
 from dataclasses import dataclass
@@ -9,6 +10,18 @@ from src.rag.pipeline import RAGPipeline
 
 logger = setup_logger(__name__)
 
+# Separators that split a multi-part question into independent retrieval sub-queries
+SUB_QUERY_SEPARATORS = re.compile(
+    r"\s*(?:;|\n|\?\s+|,\s*(?:and\s+)?then\s+|\s+and\s+then\s+)\s*",
+    re.IGNORECASE
+)
+
+
+def split_sub_queries(query: str) -> List[str]:
+    """Split a multi-part question into its retrieval sub-queries"""
+    parts = [part.strip(" ,.?") for part in SUB_QUERY_SEPARATORS.split(query)]
+    return [part for part in parts if len(part) >= 3]
+
 
 class AgentAction(str, Enum):
     """Agent action types"""
@@ -41,12 +54,46 @@ class DocumentRetrievalAgent:
         self.name = "DocumentRetrievalAgent"
         self.rag_pipeline = rag_pipeline
     
-    def execute(self, query: str, top_k: int = 5) -> Dict:
-        """Retrieve relevant documents"""
-        logger.info(f"[{self.name}] Retrieving documents for: {query}")
+    def execute(self, query: str, top_k: int = 5, query_embedding: Optional[List[float]] = None) -> Dict:
+        """Retrieve relevant documents (reusing query_embedding if the caller already has it)"""
+        logger.info("[%s] Retrieving documents for: %s", self.name, query)
+        
+        try:
+            if query_embedding is not None:
+                retrieved_docs = self.rag_pipeline.retrieve_with_embedding(query_embedding, top_k)
+            else:
+                retrieved_docs = self.rag_pipeline.retrieve(query, top_k)
+            
+            return {
+                "status": "success",
+                "agent": self.name,
+                "retrieved_docs": retrieved_docs,
+                "doc_count": len(retrieved_docs)
+            }
+        except Exception as e:
+            logger.error(f"[{self.name}] Error: {str(e)}")
+            return {
+                "status": "error",
+                "agent": self.name,
+                "error": str(e)
+            }
+
+
+    def execute_batch(self, queries: List[str], top_k: int = 5) -> Dict:
+        """Retrieve documents for several sub-queries in one batched search"""
+        logger.info("[%s] Retrieving documents for %d sub-queries", self.name, len(queries))
         
         try:
-            retrieved_docs = self.rag_pipeline.retrieve(query, top_k)
+            batch_results = self.rag_pipeline.retrieve_batch(queries, top_k)
+            
+            # Merge results, keeping the best similarity per chunk
+            merged: Dict[str, Dict] = {}
+            for results in batch_results:
+                for doc in results:
+                    existing = merged.get(doc["chunk_id"])
+                    if existing is None or doc["similarity"] > existing["similarity"]:
+                        merged[doc["chunk_id"]] = doc
+            retrieved_docs = sorted(merged.values(), key=lambda doc: doc["similarity"], reverse=True)
             
             return {
                 "status": "success",
@@ -73,7 +120,7 @@ class ReasoningAgent:
     
     def analyze_documents(self, docs: List[Dict]) -> Dict:
         """Analyze retrieved documents"""
-        logger.info(f"[{self.name}] Analyzing {len(docs)} documents")
+        logger.info("[%s] Analyzing %d documents", self.name, len(docs))
         
         analysis = {
             "total_docs": len(docs),
@@ -92,7 +139,7 @@ class ReasoningAgent:
     
     def execute(self, query: str, retrieved_docs: List[Dict]) -> Dict:
         """Execute reasoning"""
-        logger.info(f"[{self.name}] Reasoning about: {query}")
+        logger.info("[%s] Reasoning about: %s", self.name, query)
         
         try:
             analysis = self.analyze_documents(retrieved_docs)
@@ -122,7 +169,7 @@ class ResponseGenerationAgent:
     
     def execute(self, query: str, retrieved_docs: List[Dict], system_prompt: Optional[str] = None) -> Dict:
         """Generate response"""
-        logger.info(f"[{self.name}] Generating response for: {query}")
+        logger.info("[%s] Generating response for: %s", self.name, query)
         
         try:
             response = self.rag_pipeline.generate_response(query, retrieved_docs, system_prompt)
@@ -150,7 +197,7 @@ class ValidationAgent:
     
     def validate_response(self, response: str, query: str) -> Dict:
         """Validate response quality"""
-        logger.info(f"[{self.name}] Validating response")
+        logger.info("[%s] Validating response", self.name)
         
         validation_result = {
             "is_valid": True,
@@ -218,7 +265,7 @@ class AIAgent:
             input=input_data
         )
         self.thoughts.append(thought)
-        logger.info(f"[{self.name}] Thought: {action.value} - {description}")
+        logger.info("[%s] Thought: %s - %s", self.name, action.value, description)
         return thought
     
     def process_query(
@@ -226,10 +273,11 @@ class AIAgent:
         query: str,
         top_k: int = 5,
         system_prompt: Optional[str] = None,
-        return_thoughts: bool = True
+        return_thoughts: bool = True,
+        query_embedding: Optional[List[float]] = None
     ) -> Dict:
         """Process a query using coordinated agents"""
-        logger.info(f"[{self.name}] Processing query: {query}")
+        logger.info("[%s] Processing query: %s", self.name, query)
         self.thoughts = []  # Reset thoughts
         
         # Step 1: Plan
@@ -237,7 +285,45 @@ class AIAgent:
         
         # Step 2: Retrieve
         self.think(AgentAction.RETRIEVE, f"Retrieving top {top_k} relevant documents")
-        retrieval_result = self.retrieval_agent.execute(query, top_k)
+        retrieval_result = self.retrieval_agent.execute(query, top_k, query_embedding)
+        
+        if retrieval_result["status"] != "success":
+            return {
+                "status": "error",
+                "error": retrieval_result.get("error"),
+                "thoughts": [vars(t) for t in self.thoughts] if return_thoughts else None
+            }
+        
+        retrieved_docs = retrieval_result["retrieved_docs"]
+        
+        return self._complete_query(query, retrieved_docs, system_prompt, return_thoughts)
+    
+    def process_query_batched(
+        self,
+        query: str,
+        top_k: int = 5,
+        system_prompt: Optional[str] = None,
+        return_thoughts: bool = True,
+        query_embedding: Optional[List[float]] = None
+    ) -> Dict:
+        """Process a multi-part query, retrieving for all sub-queries in one batch"""
+        sub_queries = split_sub_queries(query)
+        if len(sub_queries) < 2:
+            return self.process_query(query, top_k, system_prompt, return_thoughts, query_embedding)
+        
+        logger.info("[%s] Processing multi-part query: %s", self.name, query)
+        self.thoughts = []  # Reset thoughts
+        
+        # Step 1: Plan
+        self.think(
+            AgentAction.PLAN,
+            f"Decomposed query into {len(sub_queries)} sub-queries",
+            {"sub_queries": sub_queries}
+        )
+        
+        # Step 2: Retrieve (single batched embed + search)
+        self.think(AgentAction.RETRIEVE, f"Retrieving top {top_k} documents per sub-query in one batch")
+        retrieval_result = self.retrieval_agent.execute_batch(sub_queries, top_k)
         
         if retrieval_result["status"] != "success":
             return {
@@ -248,6 +334,16 @@ class AIAgent:
         
         retrieved_docs = retrieval_result["retrieved_docs"]
         
+        return self._complete_query(query, retrieved_docs, system_prompt, return_thoughts)
+    
+    def _complete_query(
+        self,
+        query: str,
+        retrieved_docs: List[Dict],
+        system_prompt: Optional[str],
+        return_thoughts: bool
+    ) -> Dict:
+        """Reason over retrieved documents, generate and validate the response"""
         # Step 3: Reason
         self.think(AgentAction.REASON, "Analyzing retrieved documents for relevance and consistency")
         reasoning_result = self.reasoning_agent.execute(query, retrieved_docs)
@@ -284,7 +380,7 @@ class AIAgent:
             result["thoughts"] = [vars(t) for t in self.thoughts]
             result["thought_count"] = len(self.thoughts)
         
-        logger.info(f"[{self.name}] Query processed successfully")
+        logger.info("[%s] Query processed successfully", self.name)
         return result
     
     def get_thought_history(self) -> List[Dict]:
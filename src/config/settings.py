@@ -31,6 +31,15 @@ class Settings(BaseSettings):
     vector_db_type: str = "faiss"
     vector_store_path: str = "./data/vector_store"
     embedding_model: str = "intfloat/multilingual-e5-small"  # Supports 100+ languages with excellent cross-lingual retrieval
+    embedding_onnx_path: str = ""  # Optional ONNX (e.g. int8-quantized) export of embedding_model
+    embedding_cache_enabled: bool = True  # Persist chunk embeddings under data_path across uploads
+    min_similarity: float = 0.2  # Cosine similarity below which search hits are dropped
+    quantize_embeddings: bool = False  # Store chunk vectors as int8 (~4x smaller index and embeddings on disk)
+    faiss_index_factory: str = ""  # e.g. "IVF64,PQ16x8" for large stores; empty keeps an exact index
+    faiss_index_factory_min_vectors: int = 10000  # Below this the factory index is not trained
+    faiss_nprobe: int = 8  # IVF lists scanned per query
+    query_cache_size: int = 256  # Answers kept per session for repeated questions (0 disables)
+    query_cache_similarity: float = 0.98  # Cosine similarity for reusing a near-duplicate question's answer (>1 disables)
     
     # Document Processing Configuration
     max_upload_size_mb: int = 100
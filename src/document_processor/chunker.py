@@ -1,10 +1,20 @@
 """Text chunking module for semantic search preparation"""
+import re
 from typing import List
 from dataclasses import dataclass
 from src.config.logger import setup_logger
 
 logger = setup_logger(__name__)
 
+# Sentence ends (Latin, Arabic and CJK punctuation) followed by whitespace
+SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?؟。！？])\s+")
+LINE_BREAK = re.compile(r"\n+")
+WHITESPACE = re.compile(r"\s+")
+
+# Oversized paragraphs are split on sentence ends, then line breaks (e.g. table rows), then any
+# whitespace; each entry is (pattern, joiner used when regrouping the pieces)
+SPLIT_LEVELS = ((SENTENCE_BOUNDARY, " "), (LINE_BREAK, "\n"), (WHITESPACE, " "))
+
 
 @dataclass
 class TextChunk:
@@ -45,8 +55,13 @@ class TextChunker:
         """
         chunks = []
         
-        # Split by paragraphs first for semantic coherence
-        paragraphs = text.split('\n\n')
+        # Split by paragraphs first for semantic coherence; oversized paragraphs fall back to
+        # sentences, lines and words
+        paragraphs = [
+            piece
+            for paragraph in text.split('\n\n')
+            for piece in self._split_long_paragraph(paragraph.strip())
+        ]
         
         current_chunk = ""
         char_count = 0
@@ -54,7 +69,6 @@ class TextChunker:
         start_char = 0
         
         for paragraph in paragraphs:
-            paragraph = paragraph.strip()
             if not paragraph:
                 continue
             
@@ -109,6 +123,34 @@ class TextChunker:
         logger.info(f"Chunked '{source_file}' into {len(chunks)} chunks")
         return chunks
     
+    def _split_long_paragraph(self, paragraph: str, level: int = 0) -> List[str]:
+        """Group the parts of a paragraph longer than chunk_size into chunk-sized pieces
+        
+        Text without blank lines (common in PDF extraction, CSV/XLSX tables) would otherwise
+        become one huge chunk. Parts still too long are split again at the next SPLIT_LEVELS
+        level; a single unbroken token is finally cut at chunk_size.
+        """
+        if len(paragraph) <= self.chunk_size:
+            return [paragraph]
+        if level == len(SPLIT_LEVELS):
+            return [paragraph[i:i + self.chunk_size] for i in range(0, len(paragraph), self.chunk_size)]
+        
+        pattern, joiner = SPLIT_LEVELS[level]
+        pieces = []
+        current = ""
+        for part in pattern.split(paragraph):
+            if not part:
+                continue
+            for piece in self._split_long_paragraph(part, level + 1):
+                if current and len(current) + len(joiner) + len(piece) > self.chunk_size:
+                    pieces.append(current)
+                    current = piece
+                else:
+                    current = f"{current}{joiner}{piece}" if current else piece
+        if current:
+            pieces.append(current)
+        return pieces
+    
     def chunk_text_by_size(self, text: str, source_file: str = "unknown") -> List[TextChunk]:
         """
         Split text by fixed size with overlap
@@ -1,8 +1,11 @@
 """Document processing utilities for various file formats"""
+import io
 import os
 import re
+from contextlib import nullcontext
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Tuple
+from typing import BinaryIO, List, Tuple, Union
 from abc import ABC, abstractmethod
 
 try:
@@ -21,39 +24,56 @@ except ImportError:
     Document = None
 
 from src.config.logger import setup_logger
+from src.document_processor.chunker import TextChunk, TextChunker
 
 logger = setup_logger(__name__)
 
+# A document is read from a path on disk or from an open binary stream (e.g. io.BytesIO)
+DocumentSource = Union[str, BinaryIO]
+
+
+def _open_binary(source: DocumentSource):
+    """Open a path for binary reading; streams are used as-is (and left open)"""
+    return open(source, 'rb') if isinstance(source, str) else nullcontext(source)
+
+
+def _source_name(source: DocumentSource) -> str:
+    """Printable name of a document source for logging"""
+    return source if isinstance(source, str) else getattr(source, 'name', '<in-memory>')
+
 
 class DocumentProcessor(ABC):
     """Base class for document processors"""
     
     @abstractmethod
-    def process(self, file_path: str) -> str:
-        """Process a document and return its text content"""
+    def process(self, file_path: DocumentSource) -> str:
+        """Process a document (path or binary stream) and return its text content"""
         pass
 
 
 class PDFProcessor(DocumentProcessor):
     """Process PDF files"""
     
-    def process(self, file_path: str) -> str:
+    def process(self, file_path: DocumentSource) -> str:
         """Extract text from PDF"""
         if PyPDF2 is None:
             raise ImportError("PyPDF2 is required for PDF processing")
         
-        text = ""
+        pages = []
         try:
-            with open(file_path, 'rb') as file:
+            with _open_binary(file_path) as file:
                 pdf_reader = PyPDF2.PdfReader(file)
-                for page_num, page in enumerate(pdf_reader.pages):
+                for page in pdf_reader.pages:
                     page_text = page.extract_text()
-                    # Add proper spacing between pages
                     if page_text:
-                        text += page_text + "\n\n"
-            logger.info(f"Successfully processed PDF: {file_path}")
+                        pages.append(page_text)
+            # Add proper spacing between pages
+            text = "".join(page_text + "\n\n" for page_text in pages)
+            if not text.strip():
+                logger.warning(f"No text layer found in PDF (scanned documents are not OCR'd): {_source_name(file_path)}")
+            logger.info(f"Successfully processed PDF: {_source_name(file_path)}")
         except Exception as e:
-            logger.error(f"Error processing PDF {file_path}: {str(e)}")
+            logger.error(f"Error processing PDF {_source_name(file_path)}: {str(e)}")
             raise
         
         return text
@@ -62,14 +82,19 @@ class PDFProcessor(DocumentProcessor):
 class TextProcessor(DocumentProcessor):
     """Process TXT files"""
     
-    def process(self, file_path: str) -> str:
+    def process(self, file_path: DocumentSource) -> str:
         """Extract text from TXT file"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                text = file.read()
-            logger.info(f"Successfully processed TXT: {file_path}")
+            with _open_binary(file_path) as file:
+                # Same decoding and newline handling as open(path, 'r', encoding='utf-8')
+                reader = io.TextIOWrapper(file, encoding='utf-8')
+                try:
+                    text = reader.read()
+                finally:
+                    reader.detach()  # Don't close a caller-owned stream, even if decoding fails
+            logger.info(f"Successfully processed TXT: {_source_name(file_path)}")
         except Exception as e:
-            logger.error(f"Error processing TXT {file_path}: {str(e)}")
+            logger.error(f"Error processing TXT {_source_name(file_path)}: {str(e)}")
             raise
         
         return text
@@ -78,7 +103,7 @@ class TextProcessor(DocumentProcessor):
 class CSVProcessor(DocumentProcessor):
     """Process CSV files"""
     
-    def process(self, file_path: str) -> str:
+    def process(self, file_path: DocumentSource) -> str:
         """Convert CSV to text"""
         if pd is None:
             raise ImportError("pandas is required for CSV processing")
@@ -86,9 +111,9 @@ class CSVProcessor(DocumentProcessor):
         try:
             df = pd.read_csv(file_path)
             text = df.to_string()
-            logger.info(f"Successfully processed CSV: {file_path}")
+            logger.info(f"Successfully processed CSV: {_source_name(file_path)}")
         except Exception as e:
-            logger.error(f"Error processing CSV {file_path}: {str(e)}")
+            logger.error(f"Error processing CSV {_source_name(file_path)}: {str(e)}")
             raise
         
         return text
@@ -97,7 +122,7 @@ class CSVProcessor(DocumentProcessor):
 class ExcelProcessor(DocumentProcessor):
     """Process Excel files (.xlsx)"""
     
-    def process(self, file_path: str) -> str:
+    def process(self, file_path: DocumentSource) -> str:
         """Convert Excel to text"""
         if pd is None:
             raise ImportError("pandas is required for Excel processing")
@@ -109,9 +134,9 @@ class ExcelProcessor(DocumentProcessor):
                     df = pd.read_excel(excel_file, sheet_name=sheet_name)
                     text += f"\n--- Sheet: {sheet_name} ---\n"
                     text += df.to_string()
-            logger.info(f"Successfully processed Excel: {file_path}")
+            logger.info(f"Successfully processed Excel: {_source_name(file_path)}")
         except Exception as e:
-            logger.error(f"Error processing Excel {file_path}: {str(e)}")
+            logger.error(f"Error processing Excel {_source_name(file_path)}: {str(e)}")
             raise
         
         return text
@@ -120,7 +145,7 @@ class ExcelProcessor(DocumentProcessor):
 class DocxProcessor(DocumentProcessor):
     """Process DOCX files"""
     
-    def process(self, file_path: str) -> str:
+    def process(self, file_path: DocumentSource) -> str:
         """Extract text from DOCX"""
         if Document is None:
             raise ImportError("python-docx is required for DOCX processing")
@@ -130,9 +155,9 @@ class DocxProcessor(DocumentProcessor):
             doc = Document(file_path)
             for paragraph in doc.paragraphs:
                 text += paragraph.text + "\n"
-            logger.info(f"Successfully processed DOCX: {file_path}")
+            logger.info(f"Successfully processed DOCX: {_source_name(file_path)}")
         except Exception as e:
-            logger.error(f"Error processing DOCX {file_path}: {str(e)}")
+            logger.error(f"Error processing DOCX {_source_name(file_path)}: {str(e)}")
             raise
         
         return text
@@ -163,6 +188,26 @@ class DocumentProcessorFactory:
         file_extension = Path(file_path).suffix
         processor = cls.get_processor(file_extension)
         return processor.process(file_path)
+    
+    @classmethod
+    def process_bytes(cls, name: str, data: bytes) -> str:
+        """Process an in-memory document; name only selects the processor by extension"""
+        processor = cls.get_processor(Path(name).suffix)
+        stream = io.BytesIO(data)
+        stream.name = name
+        return processor.process(stream)
+
+
+@lru_cache(maxsize=None)
+def get_chunker(chunk_size: int, chunk_overlap: int) -> TextChunker:
+    """Shared chunker per configuration (stateless, so safe to share across parse threads)"""
+    return TextChunker(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+
+
+def parse_and_chunk(file_path: str, source_file: str, chunk_size: int, chunk_overlap: int) -> List[TextChunk]:
+    """Extract and chunk a document (module-level, for the upload parse pool)"""
+    text_content = DocumentProcessorFactory.get_processor(Path(source_file).suffix).process(file_path)
+    return get_chunker(chunk_size, chunk_overlap).chunk_text(text_content, source_file=source_file)
 
 
 def clean_text(text: str) -> str:
@@ -0,0 +1,75 @@
+"""Persistent embedding cache keyed by model and content hash"""
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from src.config.logger import setup_logger
+
+logger = setup_logger(__name__)
+
+# Stay well below SQLite's bound-parameter limit
+_QUERY_BATCH_SIZE = 500
+
+
+class EmbeddingCache:
+    """SQLite-backed cache mapping (model, text) hashes to float32 embeddings"""
+
+    def __init__(self, path: str, model_name: str):
+        """Open (or create) the cache database"""
+        self.path = path
+        self.model_name = model_name
+        Path(path).parent.mkdir(parents=True, exist_ok=True)
+
+        # The embedding manager is shared across Streamlit sessions (threads)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+        logger.info(f"Opened embedding cache: {path}")
+
+    def key(self, text: str) -> str:
+        """Cache key for a text under the current model"""
+        return hashlib.blake2b(f"{self.model_name}|{text}".encode("utf-8")).hexdigest()[:32]
+
+    def get_many(self, texts: List[str]) -> Dict[str, np.ndarray]:
+        """Return cached embeddings for the texts that are present"""
+        keys = {self.key(text): text for text in texts}
+        key_list = list(keys)
+        hits = {}
+
+        with self._lock:
+            for i in range(0, len(key_list), _QUERY_BATCH_SIZE):
+                batch = key_list[i:i + _QUERY_BATCH_SIZE]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", batch
+                ).fetchall()
+                for key, vector in rows:
+                    hits[keys[key]] = np.frombuffer(vector, dtype=np.float32)
+
+        return hits
+
+    def put_many(self, texts: List[str], embeddings: List[List[float]]) -> None:
+        """Store embeddings for the given texts"""
+        rows = [
+            (self.key(text), np.asarray(embedding, dtype=np.float32).tobytes())
+            for text, embedding in zip(texts, embeddings)
+        ]
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)", rows
+            )
+            self._conn.commit()
+
+    def clear(self) -> None:
+        """Remove all cached embeddings"""
+        with self._lock:
+            self._conn.execute("DELETE FROM embeddings")
+            self._conn.commit()
+        logger.info("Cleared embedding cache")
@@ -1,10 +1,13 @@
 """Embedding generation and management"""
-from typing import List, Dict
+import os
+from functools import lru_cache
+from typing import List, Dict, Optional, Union
 import numpy as np
 from abc import ABC, abstractmethod
 
 from src.config.logger import setup_logger
 from src.config.settings import settings
+from src.embeddings.cache import EmbeddingCache
 
 logger = setup_logger(__name__)
 
@@ -18,7 +21,7 @@ class EmbeddingModel(ABC):
         pass
     
     @abstractmethod
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+    def embed_texts(self, texts: List[str], batch_size: int = 32) -> Union[np.ndarray, List[List[float]]]:
         """Embed multiple text strings"""
         pass
     
@@ -51,16 +54,86 @@ class SentenceTransformerEmbedding(EmbeddingModel):
         embeddings = self.model.encode([text])
         return embeddings[0].tolist()
     
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Embed multiple texts"""
-        embeddings = self.model.encode(texts)
-        return embeddings.tolist()
+    def embed_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Embed multiple texts in padded batches (encode sorts by length internally)"""
+        embeddings = self.model.encode(
+            texts,
+            batch_size=batch_size,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+        return embeddings
     
     def get_dimension(self) -> int:
         """Get embedding dimension"""
         return self.model.get_sentence_embedding_dimension()
 
 
+class ONNXEmbedding(EmbeddingModel):
+    """Embedding using an ONNX export of the sentence-transformer (e.g. int8-quantized)"""
+    
+    def __init__(self, onnx_path: str, model_name: str = None):
+        """Initialize ONNX Runtime session and tokenizer"""
+        self.model_name = model_name or settings.embedding_model
+        
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+            
+            sess_options = ort.SessionOptions()
+            sess_options.intra_op_num_threads = os.cpu_count() or 1
+            self.session = ort.InferenceSession(
+                onnx_path,
+                sess_options=sess_options,
+                providers=["CPUExecutionProvider"]
+            )
+            self.tokenizer = AutoTokenizer.from_pretrained(self.model_name)
+            self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+            self.output_names = [output.name for output in self.session.get_outputs()]
+            self.dimension = self._encode_batch(["dimension probe"]).shape[1]
+            logger.info(f"Loaded ONNX embedding model: {onnx_path}")
+        except ImportError:
+            logger.error("onnxruntime and transformers are required for ONNX embedding")
+            raise
+        except Exception as e:
+            logger.error(f"Failed to load ONNX embedding model: {str(e)}")
+            raise
+    
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        """Run one batched forward pass and return sentence embeddings"""
+        encoded = self.tokenizer(texts, padding=True, truncation=True, return_tensors="np")
+        inputs = {name: value.astype(np.int64) for name, value in encoded.items() if name in self.input_names}
+        outputs = dict(zip(self.output_names, self.session.run(None, inputs)))
+        
+        # sentence-similarity exports already pool; feature-extraction exports need mean pooling
+        if "sentence_embedding" in outputs:
+            return outputs["sentence_embedding"]
+        token_embeddings = outputs[self.output_names[0]]
+        mask = encoded["attention_mask"][..., None].astype(np.float32)
+        return (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+    
+    def embed_text(self, text: str) -> List[float]:
+        """Embed a single text"""
+        return self.embed_texts([text])[0].tolist()
+    
+    def embed_texts(self, texts: List[str], batch_size: int = 32) -> np.ndarray:
+        """Embed multiple texts, batching length-sorted texts to minimize padding"""
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        sorted_texts = [texts[i] for i in order]
+        batches = [
+            self._encode_batch(sorted_texts[i:i + batch_size])
+            for i in range(0, len(sorted_texts), batch_size)
+        ]
+        embeddings = np.empty((len(texts), self.dimension), dtype=np.float32)
+        embeddings[order] = np.vstack(batches)
+        return embeddings
+    
+    def get_dimension(self) -> int:
+        """Get embedding dimension"""
+        return self.dimension
+
+
 class OpenAIEmbedding(EmbeddingModel):
     """Embedding using OpenAI API"""
     
@@ -85,8 +158,8 @@ class OpenAIEmbedding(EmbeddingModel):
         embeddings = self.embed_texts([text])
         return embeddings[0]
     
-    def embed_texts(self, texts: List[str]) -> List[List[float]]:
-        """Embed multiple texts via OpenAI"""
+    def embed_texts(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
+        """Embed multiple texts via OpenAI (one request; batch_size is unused)"""
         try:
             response = self.client.embeddings.create(
                 input=texts,
@@ -111,10 +184,29 @@ class EmbeddingManager:
         """Initialize embedding manager"""
         if use_openai:
             self.model = OpenAIEmbedding()
+        elif settings.embedding_onnx_path and os.path.exists(settings.embedding_onnx_path):
+            try:
+                self.model = ONNXEmbedding(settings.embedding_onnx_path)
+            except Exception as e:
+                logger.warning(f"Falling back to PyTorch embedding model: {str(e)}")
+                self.model = SentenceTransformerEmbedding()
         else:
             self.model = SentenceTransformerEmbedding()
         
-        self.embedding_cache: Dict[str, List[float]] = {}
+        self.embedding_cache: Dict[str, Union[np.ndarray, List[float]]] = {}
+        self.disk_cache = self._open_disk_cache() if settings.embedding_cache_enabled else None
+    
+    def _open_disk_cache(self) -> Optional[EmbeddingCache]:
+        """Open the persistent embedding cache, namespaced by backend and model"""
+        model_name = getattr(self.model, "model_name", None) or self.model.model
+        try:
+            return EmbeddingCache(
+                str(settings.data_path / "embedding_cache.sqlite"),
+                model_name=f"{type(self.model).__name__}:{model_name}"
+            )
+        except Exception as e:
+            logger.warning(f"Embedding disk cache unavailable: {str(e)}")
+            return None
     
     def embed_text(self, text: str, use_cache: bool = True) -> List[float]:
         """Embed text with optional caching"""
@@ -128,35 +220,91 @@ class EmbeddingManager:
         
         return embedding
     
-    def embed_texts(self, texts: List[str], use_cache: bool = True) -> List[List[float]]:
-        """Embed multiple texts"""
+    def embed_texts(
+        self,
+        texts: List[str],
+        use_cache: bool = True,
+        batch_size: int = 32,
+        persist: bool = True
+    ) -> np.ndarray:
+        """Embed multiple texts in batches, returning an (N, d) float32 matrix
+        
+        persist=False keeps the texts out of the disk cache (e.g. user queries), using only
+        the in-memory tier.
+        """
         embeddings = []
         texts_to_embed = []
         text_indices = []
         
+        if not texts:
+            return np.empty((0, self.get_dimension()), dtype=np.float32)
+        
         for i, text in enumerate(texts):
             if use_cache and text in self.embedding_cache:
-                embeddings.append(None)
+                embeddings.append(self.embedding_cache[text])
             else:
                 embeddings.append(None)
                 texts_to_embed.append(text)
                 text_indices.append(i)
         
+        # Reuse embeddings persisted by earlier uploads
+        if texts_to_embed and use_cache and persist and self.disk_cache:
+            disk_hits = self.disk_cache.get_many(texts_to_embed)
+            if disk_hits:
+                remaining_texts = []
+                remaining_indices = []
+                for text, idx in zip(texts_to_embed, text_indices):
+                    if text in disk_hits:
+                        embeddings[idx] = disk_hits[text]
+                        self.embedding_cache[text] = disk_hits[text]
+                    else:
+                        remaining_texts.append(text)
+                        remaining_indices.append(idx)
+                texts_to_embed, text_indices = remaining_texts, remaining_indices
+        
         if texts_to_embed:
-            new_embeddings = self.model.embed_texts(texts_to_embed)
+            new_embeddings = np.asarray(
+                self.model.embed_texts(texts_to_embed, batch_size=batch_size), dtype=np.float32
+            )
             
             for i, idx in enumerate(text_indices):
                 embeddings[idx] = new_embeddings[i]
                 if use_cache:
                     self.embedding_cache[texts[idx]] = new_embeddings[i]
+            
+            if use_cache and persist and self.disk_cache:
+                self.disk_cache.put_many(texts_to_embed, new_embeddings)
+            
+            # Every row came from the model, already in input order: hand its matrix over as-is
+            if len(texts_to_embed) == len(texts):
+                return new_embeddings
         
-        return embeddings
+        # Assemble cache hits and fresh rows into one contiguous matrix
+        matrix = np.empty((len(texts), len(embeddings[0])), dtype=np.float32)
+        for i, embedding in enumerate(embeddings):
+            matrix[i] = embedding
+        return matrix
     
     def get_dimension(self) -> int:
         """Get embedding dimension"""
         return self.model.get_dimension()
     
+    def warm_up(self) -> None:
+        """Run one throwaway forward pass (bypassing caches) so the first real query is steady-state"""
+        if isinstance(self.model, OpenAIEmbedding):
+            return  # Remote API: nothing local to warm up
+        try:
+            self.model.embed_texts(["warm-up"], batch_size=1)
+        except Exception as e:
+            logger.warning(f"Embedding warm-up failed: {str(e)}")
+    
     def clear_cache(self):
         """Clear embedding cache"""
         self.embedding_cache.clear()
         logger.info("Cleared embedding cache")
+
+
+@lru_cache(maxsize=None)
+def get_embedding_manager(use_openai: bool = False) -> EmbeddingManager:
+    """Process-wide EmbeddingManager, so the model weights are loaded only once"""
+    return EmbeddingManager(use_openai=use_openai)
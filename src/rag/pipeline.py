@@ -1,8 +1,9 @@
 """Retrieval-Augmented Generation (RAG) pipeline"""
-from typing import List, Dict, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Dict, Optional, Iterator
 from src.config.logger import setup_logger
 from src.config.settings import settings
-from src.embeddings.embedding import EmbeddingManager
+from src.embeddings.embedding import EmbeddingManager, get_embedding_manager
 from src.retrieval.vector_store import VectorStoreManager
 
 logger = setup_logger(__name__)
@@ -11,13 +12,20 @@ logger = setup_logger(__name__)
 class RAGPipeline:
     """Retrieval-Augmented Generation pipeline"""
     
-    def __init__(self, use_openai_embeddings: bool = False):
-        """Initialize RAG pipeline"""
-        self.embedding_manager = EmbeddingManager(use_openai=use_openai_embeddings)
-        self.vector_store_manager = VectorStoreManager(
+    def __init__(
+        self,
+        use_openai_embeddings: bool = False,
+        embedding_manager: Optional[EmbeddingManager] = None,
+        vector_store_manager: Optional[VectorStoreManager] = None
+    ):
+        """Initialize RAG pipeline, optionally reusing already-loaded components"""
+        self.embedding_manager = embedding_manager or get_embedding_manager(use_openai=use_openai_embeddings)
+        self.vector_store_manager = vector_store_manager or VectorStoreManager(
             dimension=self.embedding_manager.get_dimension()
         )
         self.llm = None
+        # Single background thread for LLM connection warm-up (see start_llm_warm_up)
+        self._warm_up_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="llm-warm-up")
         self._initialize_llm()
     
     def _initialize_llm(self):
@@ -44,24 +52,53 @@ class RAGPipeline:
             logger.error(f"Failed to initialize LLM: {str(e)}")
             raise
     
+    def _warm_up_llm(self) -> None:
+        """Open (or refresh) the pooled HTTPS connection to the LLM endpoint without generating tokens"""
+        # langchain-openai keeps the OpenAI client either as root_client or behind chat.completions
+        client = getattr(self.llm, "root_client", None) or getattr(getattr(self.llm, "client", None), "_client", None)
+        if client is None:
+            return
+        try:
+            client.models.list()
+        except Exception as e:
+            logger.warning(f"LLM connection warm-up failed: {str(e)}")
+    
+    def start_llm_warm_up(self) -> Future:
+        """Warm up the LLM connection in the background while retrieval runs"""
+        return self._warm_up_executor.submit(self._warm_up_llm)
+    
     def retrieve(self, query: str, top_k: int = 5) -> List[Dict]:
         """Retrieve relevant documents for a query"""
         # Generate embedding for query
         query_embedding = self.embedding_manager.embed_text(query)
         
+        return self.retrieve_with_embedding(query_embedding, top_k)
+    
+    def retrieve_with_embedding(self, query_embedding: List[float], top_k: int = 5) -> List[Dict]:
+        """Retrieve relevant documents for an already-embedded query"""
         # Search vector store
         results = self.vector_store_manager.search(query_embedding, top_k)
         
-        logger.info(f"Retrieved {len(results)} documents for query")
+        logger.info("Retrieved %d documents for query", len(results))
         return results
     
-    def generate_response(
+    def retrieve_batch(self, queries: List[str], top_k: int = 5) -> List[List[Dict]]:
+        """Retrieve relevant documents for several queries with one embed and one search call"""
+        # Queries stay out of the on-disk embedding cache, which is meant for document chunks
+        query_embeddings = self.embedding_manager.embed_texts(queries, persist=False)
+        
+        batch_results = self.vector_store_manager.batch_search(query_embeddings, top_k)
+        
+        logger.info("Retrieved documents for %d queries in one batch", len(queries))
+        return batch_results
+    
+    def _build_messages(
         self,
         query: str,
         retrieved_docs: List[Dict],
         system_prompt: Optional[str] = None
-    ) -> str:
-        """Generate response using LLM with retrieved context"""
+    ) -> List:
+        """Build the LLM message list for a query and its retrieved context"""
         # Build context from retrieved documents
         context = "\n\n".join([
             f"Document: {doc['source_file']} (Chunk {doc['chunk_index']}/{doc['total_chunks']})\n"
@@ -89,18 +126,43 @@ QUESTION: {query}
 
 ANSWER:"""
         
+        return [
+            self.SystemMessage(content=system_prompt),
+            self.HumanMessage(content=user_message)
+        ]
+    
+    def generate_response(
+        self,
+        query: str,
+        retrieved_docs: List[Dict],
+        system_prompt: Optional[str] = None
+    ) -> str:
+        """Generate response using LLM with retrieved context"""
         try:
             # Call LLM
-            messages = [
-                self.SystemMessage(content=system_prompt),
-                self.HumanMessage(content=user_message)
-            ]
+            messages = self._build_messages(query, retrieved_docs, system_prompt)
             response = self.llm.invoke(messages)
             return response.content
         except Exception as e:
             logger.error(f"Error generating response: {str(e)}")
             raise
     
+    def generate_response_stream(
+        self,
+        query: str,
+        retrieved_docs: List[Dict],
+        system_prompt: Optional[str] = None
+    ) -> Iterator[str]:
+        """Stream response tokens from the LLM as they are generated"""
+        try:
+            messages = self._build_messages(query, retrieved_docs, system_prompt)
+            for chunk in self.llm.stream(messages):
+                if chunk.content:
+                    yield chunk.content
+        except Exception as e:
+            logger.error(f"Error streaming response: {str(e)}")
+            raise
+    
     def query(self, query: str, top_k: int = 5, system_prompt: Optional[str] = None) -> Dict:
         """Complete RAG query: retrieve and generate response"""
         try:
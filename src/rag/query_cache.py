@@ -0,0 +1,150 @@
+"""Exact-match and semantic cache for RAG answers"""
+import re
+import hashlib
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+
+from src.config.logger import setup_logger
+from src.config.settings import settings
+
+logger = setup_logger(__name__)
+
+_PUNCTUATION = re.compile(r"[^\w\s]")
+_WHITESPACE = re.compile(r"\s+")
+_NUMBER = re.compile(r"\d+")
+
+
+def normalize_query(query: str) -> str:
+    """Lowercase, strip punctuation and collapse whitespace"""
+    query = _PUNCTUATION.sub(" ", query.lower())
+    return _WHITESPACE.sub(" ", query).strip()
+
+
+def query_numbers(query: str) -> Tuple[str, ...]:
+    """Numeric tokens (years, amounts, IDs) of the normalized query, leading zeros dropped"""
+    return tuple(number.lstrip("0") or "0" for number in _NUMBER.findall(normalize_query(query)))
+
+
+class QueryCache:
+    """LRU cache of (response, retrieved_docs) with a FAISS lookup over recent query embeddings"""
+    
+    def __init__(self, max_size: int = None, similarity_threshold: float = None):
+        """Initialize an empty cache"""
+        try:
+            import faiss
+            self.faiss = faiss
+        except ImportError:
+            logger.error("faiss-cpu is required for the semantic query cache")
+            raise
+        
+        self.max_size = settings.query_cache_size if max_size is None else max_size
+        self.similarity_threshold = (
+            settings.query_cache_similarity if similarity_threshold is None else similarity_threshold
+        )
+        # key -> (context, numbers, embedding, response, retrieved_docs), oldest first
+        self.entries: "OrderedDict[str, Tuple[str, Tuple[str, ...], Optional[np.ndarray], str, List[Dict]]]" = (
+            OrderedDict()
+        )
+        self.index = None
+        self.index_keys: List[str] = []
+    
+    @staticmethod
+    def make_key(query: str, context: str) -> str:
+        """Exact-match key for a query under a given answer context"""
+        return hashlib.blake2b(f"{context}|{normalize_query(query)}".encode("utf-8")).hexdigest()[:32]
+    
+    @staticmethod
+    def make_context(*parts) -> str:
+        """Fingerprint of everything besides the question that shapes the answer"""
+        return hashlib.blake2b("|".join(str(part) for part in parts).encode("utf-8")).hexdigest()[:32]
+    
+    def get(
+        self,
+        query: str,
+        context: str,
+        query_embedding: Optional[List[float]] = None
+    ) -> Optional[Tuple[str, List[Dict]]]:
+        """Return a cached (response, retrieved_docs) for the query, or None"""
+        key = self.make_key(query, context)
+        if key in self.entries:
+            self.entries.move_to_end(key)
+            _, _, _, response, retrieved_docs = self.entries[key]
+            logger.info("Query cache hit (exact)")
+            return response, retrieved_docs
+        
+        if query_embedding is None or self.index is None or self.index.ntotal == 0:
+            return None
+        
+        # Nearest cached queries; only ones answered under the same context qualify, and only
+        # with the same numbers: "revenue in 2022" and "... in 2023" embed almost identically
+        numbers = query_numbers(query)
+        query_array = self._as_unit_vector(query_embedding)
+        scores, indices = self.index.search(query_array, min(8, self.index.ntotal))
+        for score, idx in zip(scores[0], indices[0]):
+            if idx < 0 or score < self.similarity_threshold:
+                break
+            match_key = self.index_keys[idx]
+            entry = self.entries.get(match_key)
+            if entry is not None and entry[0] == context and entry[1] == numbers:
+                self.entries.move_to_end(match_key)
+                logger.info("Query cache hit (semantic, similarity=%.3f)", score)
+                return entry[3], entry[4]
+        
+        return None
+    
+    def put(
+        self,
+        query: str,
+        context: str,
+        response: str,
+        retrieved_docs: List[Dict],
+        query_embedding: Optional[List[float]] = None
+    ) -> None:
+        """Cache the answer to a query"""
+        if self.max_size <= 0:
+            return
+        key = self.make_key(query, context)
+        embedding = self._as_unit_vector(query_embedding) if query_embedding is not None else None
+        self.entries[key] = (context, query_numbers(query), embedding, response, retrieved_docs)
+        self.entries.move_to_end(key)
+        
+        if len(self.entries) > self.max_size:
+            self.entries.popitem(last=False)
+            # FAISS flat indexes have no cheap delete; rebuilding a few hundred vectors is trivial
+            self._rebuild_index()
+        elif embedding is not None:
+            self._ensure_index(embedding.shape[1])
+            self.index.add(embedding)
+            self.index_keys.append(key)
+    
+    def clear(self) -> None:
+        """Drop all cached answers"""
+        self.entries.clear()
+        self.index = None
+        self.index_keys = []
+    
+    def __len__(self) -> int:
+        return len(self.entries)
+    
+    def _as_unit_vector(self, embedding: List[float]) -> np.ndarray:
+        """Query embedding as a normalized (1, d) float32 array"""
+        array = np.array([embedding], dtype=np.float32)
+        self.faiss.normalize_L2(array)
+        return array
+    
+    def _ensure_index(self, dimension: int) -> None:
+        """Create the inner-product index on first use"""
+        if self.index is None:
+            self.index = self.faiss.IndexFlatIP(dimension)
+    
+    def _rebuild_index(self) -> None:
+        """Re-index the embeddings of the entries still in the cache"""
+        self.index = None
+        self.index_keys = []
+        for key, (_, _, embedding, _, _) in self.entries.items():
+            if embedding is None:
+                continue
+            self._ensure_index(embedding.shape[1])
+            self.index.add(embedding)
+            self.index_keys.append(key)
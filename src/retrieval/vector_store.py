@@ -1,17 +1,29 @@
 """Vector database implementation using FAISS"""
 import os
 import json
+import threading
+import time
+from pathlib import Path
 from typing import List, Tuple, Dict, Optional
 from dataclasses import dataclass, asdict
 import numpy as np
 from abc import ABC, abstractmethod
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 from src.config.logger import setup_logger
 from src.config.settings import settings
 from src.document_processor.chunker import TextChunk
 
 logger = setup_logger(__name__)
 
+# Index file headers (fourcc) of flat / scalar-quantized indexes, whose codes IO_FLAG_MMAP_IFC maps.
+# IO_FLAG_MMAP only maps IVF inverted lists, and the two flags cannot be combined.
+_FLAT_CODES_FOURCCS = {b"IxFI", b"IxF2", b"IxFl", b"IxSQ"}
+
 
 @dataclass
 class DocumentMetadata:
@@ -25,6 +37,37 @@ class DocumentMetadata:
     content: str = ""  # Actual chunk text content
 
 
+def quantize_int8(embeddings: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Quantize vectors to int8 codes with a per-vector float16 scale (max|v| / 127)"""
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    scales = np.abs(embeddings).max(axis=1, keepdims=True) / 127.0
+    scales[scales == 0] = 1.0
+    codes = np.clip(np.rint(embeddings / scales), -127, 127).astype(np.int8)
+    return codes, scales.astype(np.float16)
+
+
+def dequantize_int8(codes: np.ndarray, scales: np.ndarray) -> np.ndarray:
+    """Reconstruct float32 vectors from int8 codes and per-vector scales"""
+    return codes.astype(np.float32) * scales.astype(np.float32)
+
+
+def _write_json_atomic(path: str, obj) -> None:
+    """Serialize in memory, write once to a temp file, then rename over path"""
+    if orjson is not None:
+        Path(path + ".tmp").write_bytes(orjson.dumps(obj, option=orjson.OPT_INDENT_2))
+    else:
+        Path(path + ".tmp").write_text(json.dumps(obj, indent=2), encoding="utf-8")
+    os.replace(path + ".tmp", path)
+
+
+def _read_json(path: str):
+    """Parse a JSON file (orjson when available)"""
+    if orjson is not None:
+        return orjson.loads(Path(path).read_bytes())
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
 class VectorStore(ABC):
     """Base class for vector stores"""
     
@@ -52,8 +95,8 @@ class VectorStore(ABC):
 class FAISSVectorStore(VectorStore):
     """FAISS-based vector store"""
     
-    def __init__(self, dimension: int = 384):
-        """Initialize FAISS vector store"""
+    def __init__(self, dimension: int = 384, quantize: Optional[bool] = None):
+        """Initialize FAISS vector store (quantize=True stores vectors as int8)"""
         try:
             import faiss
             self.faiss = faiss
@@ -62,20 +105,56 @@ class FAISSVectorStore(VectorStore):
             raise
         
         self.dimension = dimension
-        self.index = self.faiss.IndexFlatL2(dimension)
+        self.quantize = settings.quantize_embeddings if quantize is None else quantize
+        self.index = self._new_index()
+        # Chunks added since the last load/save live here, so `index` can stay a read-only mmap
+        self.write_buffer = self._new_index()
         self.metadata: List[DocumentMetadata] = []
-        self.embeddings: np.ndarray = np.empty((0, dimension), dtype=np.float32)
+        # chunk_id -> position in metadata (first occurrence), for O(1) lookups
+        self.chunk_positions: Dict[str, int] = {}
+        # Content hash -> {source_file, chunk_count, ts} for every file indexed into this store
+        self.ingested_files: Dict[str, Dict] = {}
+        self.embeddings: np.ndarray = np.empty((0, dimension), dtype=self._embedding_dtype())
+        # Per-vector dequantization scales, only used when quantize=True
+        self.embedding_scales: np.ndarray = np.empty((0, 1), dtype=np.float16)
+    
+    def _embedding_dtype(self):
+        """dtype of the stored embedding matrix"""
+        return np.int8 if self.quantize else np.float32
+    
+    def _new_index(self):
+        """Create an empty inner-product index (cosine similarity on unit vectors)"""
+        if not self.quantize:
+            return self.faiss.IndexFlatIP(self.dimension)
+        
+        # 8-bit scalar quantizer over [-1, 1]: unit vectors need no data-dependent training
+        index = self.faiss.IndexScalarQuantizer(
+            self.dimension,
+            self.faiss.ScalarQuantizer.QT_8bit_uniform,
+            self.faiss.METRIC_INNER_PRODUCT,
+        )
+        bounds = np.vstack([-np.ones(self.dimension), np.ones(self.dimension)]).astype(np.float32)
+        index.train(bounds)
+        return index
+    
+    def get_embeddings(self) -> np.ndarray:
+        """Stored embeddings as float32 (dequantized when quantize=True)"""
+        if self.quantize:
+            return dequantize_int8(self.embeddings, self.embedding_scales)
+        return np.asarray(self.embeddings, dtype=np.float32)
     
     def add_documents(self, chunks: List[TextChunk], embeddings: List[List[float]]) -> None:
         """Add document chunks to vector store"""
-        if not chunks or not embeddings:
+        if not chunks or len(embeddings) == 0:
             logger.warning("No chunks or embeddings provided")
             return
         
+        # Normalize once at insert time so search is a single dot product per vector
         embeddings_array = np.array(embeddings, dtype=np.float32)
+        self.faiss.normalize_L2(embeddings_array)
         
-        # Add to FAISS index
-        self.index.add(embeddings_array)
+        # Add to in-memory write buffer (merged into the main index on save)
+        self.write_buffer.add(embeddings_array)
         
         # Store metadata
         for chunk in chunks:
@@ -88,58 +167,173 @@ class FAISSVectorStore(VectorStore):
                 end_char=chunk.end_char,
                 content=chunk.content,
             )
+            self.chunk_positions.setdefault(chunk.chunk_id, len(self.metadata))
             self.metadata.append(metadata)
         
         # Store embeddings
-        self.embeddings = np.vstack([self.embeddings, embeddings_array])
+        if self.quantize:
+            codes, scales = quantize_int8(embeddings_array)
+            self.embeddings = np.vstack([self.embeddings, codes])
+            self.embedding_scales = np.vstack([self.embedding_scales, scales])
+        else:
+            self.embeddings = np.vstack([self.embeddings, embeddings_array])
         
         logger.info(f"Added {len(chunks)} chunks to vector store. Total: {len(self.metadata)}")
     
-    def search(self, query_embedding: List[float], top_k: int = 5) -> List[Tuple[str, float]]:
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        min_similarity: float = None
+    ) -> List[Tuple[str, float]]:
         """Search for similar chunks"""
-        query_array = np.array([query_embedding], dtype=np.float32)
+        return self.batch_search([query_embedding], top_k, min_similarity)[0]
+    
+    def batch_search(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        min_similarity: float = None
+    ) -> List[List[Tuple[str, float]]]:
+        """Search for similar chunks for several queries in one FAISS call per index"""
+        if min_similarity is None:
+            min_similarity = settings.min_similarity
+        query_array = np.array(query_embeddings, dtype=np.float32)
+        self.faiss.normalize_L2(query_array)
+        top_k = min(top_k, len(self.metadata))
         
-        distances, indices = self.index.search(query_array, min(top_k, len(self.metadata)))
+        # Search the persisted index and the write buffer, then merge by score
+        candidates = [[] for _ in range(len(query_array))]
+        for index, offset in ((self.index, 0), (self.write_buffer, self.index.ntotal)):
+            if index.ntotal == 0 or top_k == 0:
+                continue
+            scores, indices = index.search(query_array, min(top_k, index.ntotal))
+            for row, (row_scores, row_indices) in enumerate(zip(scores, indices)):
+                # Drop below-threshold hits before any metadata lookup
+                candidates[row].extend(
+                    (score, idx + offset)
+                    for score, idx in zip(row_scores, row_indices)
+                    if idx >= 0 and score >= min_similarity
+                )
         
-        results = []
-        for distance, idx in zip(distances[0], indices[0]):
-            if idx < len(self.metadata):
-                metadata = self.metadata[idx]
-                # Convert L2 distance to similarity score
-                similarity = 1 / (1 + distance)
-                results.append((metadata.chunk_id, float(similarity)))
+        all_results = []
+        for row_candidates in candidates:
+            row_candidates.sort(key=lambda candidate: candidate[0], reverse=True)
+            results = []
+            for similarity, idx in row_candidates[:top_k]:
+                if idx < len(self.metadata):
+                    metadata = self.metadata[idx]
+                    # Inner product of unit vectors is the cosine similarity
+                    results.append((metadata.chunk_id, float(similarity)))
+            all_results.append(results)
         
-        return results
+        return all_results
     
     def get_chunk_by_id(self, chunk_id: str) -> Optional[Dict]:
         """Get chunk metadata by ID"""
-        for metadata in self.metadata:
-            if metadata.chunk_id == chunk_id:
-                return asdict(metadata)
-        return None
+        position = self.chunk_positions.get(chunk_id)
+        if position is None:
+            return None
+        return asdict(self.metadata[position])
+    
+    def _build_index(self, embeddings: np.ndarray):
+        """Build the main index over all stored embeddings
+        
+        Uses settings.faiss_index_factory (e.g. "IVF64,PQ16x8") once the store is large
+        enough to train it; smaller stores keep the exact flat / scalar-quantized index.
+        """
+        factory = settings.faiss_index_factory
+        if factory and len(embeddings) >= settings.faiss_index_factory_min_vectors:
+            index = self.faiss.index_factory(self.dimension, factory, self.faiss.METRIC_INNER_PRODUCT)
+            index.train(embeddings)
+            logger.info(f"Trained '{factory}' index on {len(embeddings)} vectors")
+        else:
+            index = self._new_index()
+        if len(embeddings):
+            index.add(embeddings)
+        self._configure_index(index)
+        return index
+    
+    def _configure_index(self, index) -> None:
+        """Apply search-time parameters (nprobe for IVF indexes)"""
+        ivf = self.faiss.try_extract_index_ivf(index)
+        if ivf is not None:
+            ivf.nprobe = settings.faiss_nprobe
+    
+    def _rebuild_index(self) -> None:
+        """Rebuild the main index in RAM from all stored embeddings"""
+        self.index = self._build_index(np.ascontiguousarray(self.get_embeddings()))
+        self.write_buffer.reset()
+    
+    def _merge_write_buffer(self) -> None:
+        """Fold buffered chunks into the main index
+        
+        A trained IVF factory index is extended in place with just the new vectors, so
+        training runs once, when the store first reaches faiss_index_factory_min_vectors.
+        Flat / scalar-quantized indexes have no training and are simply rebuilt.
+        """
+        ivf = self.faiss.try_extract_index_ivf(self.index) if settings.faiss_index_factory else None
+        if ivf is None:
+            self._rebuild_index()
+            return
+        
+        # Memory-mapped inverted lists are read-only: copy them into RAM (codes only, no retraining)
+        # (ivf.invlists is the InvertedLists base proxy; downcast to see the concrete type)
+        if not isinstance(self.faiss.downcast_InvertedLists(ivf.invlists), self.faiss.ArrayInvertedLists):
+            invlists = self.faiss.ArrayInvertedLists(ivf.nlist, ivf.code_size)
+            for list_no in range(ivf.nlist):
+                list_size = ivf.invlists.list_size(list_no)
+                if list_size:
+                    invlists.add_entries(
+                        list_no, list_size, ivf.invlists.get_ids(list_no), ivf.invlists.get_codes(list_no)
+                    )
+            ivf.replace_invlists(invlists, True)
+            invlists.this.disown()  # Owned by the index now
+        
+        start = self.index.ntotal
+        if self.quantize:
+            new_embeddings = dequantize_int8(self.embeddings[start:], self.embedding_scales[start:])
+        else:
+            new_embeddings = np.asarray(self.embeddings[start:], dtype=np.float32)
+        self.index.add(np.ascontiguousarray(new_embeddings))
+        self.write_buffer.reset()
     
     def save(self, path: str) -> None:
         """Save vector store to disk"""
         os.makedirs(path, exist_ok=True)
         
-        # Save FAISS index
-        index_path = os.path.join(path, "faiss.index")
-        self.faiss.write_index(self.index, index_path)
+        if self.write_buffer.ntotal > 0:
+            self._merge_write_buffer()
         
         # Save metadata
-        metadata_path = os.path.join(path, "metadata.json")
         metadata_dicts = [asdict(m) for m in self.metadata]
-        with open(metadata_path, 'w') as f:
-            json.dump(metadata_dicts, f, indent=2)
+        _write_json_atomic(os.path.join(path, "metadata.json"), metadata_dicts)
+        
+        # Save ingested-file manifest
+        _write_json_atomic(os.path.join(path, "ingested.json"), self.ingested_files)
         
         # Save embeddings
         embeddings_path = os.path.join(path, "embeddings.npy")
-        np.save(embeddings_path, self.embeddings)
+        np.save(os.path.join(path, "embeddings.tmp.npy"), self.embeddings)
+        os.replace(os.path.join(path, "embeddings.tmp.npy"), embeddings_path)
+        
+        scales_path = os.path.join(path, "embedding_scales.npy")
+        if self.quantize:
+            np.save(os.path.join(path, "embedding_scales.tmp.npy"), self.embedding_scales)
+            os.replace(os.path.join(path, "embedding_scales.tmp.npy"), scales_path)
+        elif os.path.exists(scales_path):
+            os.remove(scales_path)
+        
+        # Save FAISS index last: its mtime tells readers a complete store is on disk
+        # (write then rename so an existing mmap of the old file stays valid)
+        index_path = os.path.join(path, "faiss.index")
+        self.faiss.write_index(self.index, index_path + ".tmp")
+        os.replace(index_path + ".tmp", index_path)
         
         logger.info(f"Saved vector store to {path}")
     
-    def load(self, path: str) -> None:
-        """Load vector store from disk"""
+    def load(self, path: str, mmap: bool = False) -> None:
+        """Load vector store from disk (memory-mapped and read-only when mmap=True)"""
         if not os.path.exists(path):
             logger.warning(f"Vector store path does not exist: {path}")
             return
@@ -147,24 +341,74 @@ class FAISSVectorStore(VectorStore):
         # Load FAISS index
         index_path = os.path.join(path, "faiss.index")
         if os.path.exists(index_path):
-            self.index = self.faiss.read_index(index_path)
+            if mmap:
+                self.index = self.faiss.read_index(index_path, self._mmap_io_flags(index_path))
+            else:
+                self.index = self.faiss.read_index(index_path)
+            self._configure_index(self.index)
+            self.write_buffer.reset()
         
         # Load metadata
         metadata_path = os.path.join(path, "metadata.json")
         if os.path.exists(metadata_path):
-            with open(metadata_path, 'r') as f:
-                metadata_dicts = json.load(f)
-                self.metadata = [
-                    DocumentMetadata(**m) for m in metadata_dicts
-                ]
+            metadata_dicts = _read_json(metadata_path)
+            self.metadata = [
+                DocumentMetadata(**m) for m in metadata_dicts
+            ]
+            self.chunk_positions = {}
+            for position, metadata in enumerate(self.metadata):
+                self.chunk_positions.setdefault(metadata.chunk_id, position)
+        
+        # Load ingested-file manifest (absent for stores saved before it existed)
+        ingested_path = os.path.join(path, "ingested.json")
+        if os.path.exists(ingested_path):
+            self.ingested_files = _read_json(ingested_path)
+        else:
+            self.ingested_files = {}
         
         # Load embeddings
         embeddings_path = os.path.join(path, "embeddings.npy")
         if os.path.exists(embeddings_path):
-            self.embeddings = np.load(embeddings_path)
+            self.embeddings = np.load(embeddings_path, mmap_mode="r" if mmap else None)
+        scales_path = os.path.join(path, "embedding_scales.npy")
+        if os.path.exists(scales_path):
+            self.embedding_scales = np.load(scales_path)
+        
+        # Stores saved before the switch to cosine similarity used an L2 index
+        if self.index.metric_type != self.faiss.METRIC_INNER_PRODUCT:
+            logger.info("Rebuilding legacy L2 index as a normalized inner-product index")
+            embeddings = np.array(self.embeddings, dtype=np.float32)
+            self.faiss.normalize_L2(embeddings)
+            self._set_embeddings(embeddings)
+            self._rebuild_index()
+        elif self.embeddings.dtype != self._embedding_dtype():
+            # Store was saved with the other quantize_embeddings setting
+            logger.info(f"Converting vector store to {'int8' if self.quantize else 'float32'} embeddings")
+            if self.embeddings.dtype == np.int8:
+                embeddings = dequantize_int8(self.embeddings, self.embedding_scales)
+            else:
+                embeddings = np.array(self.embeddings, dtype=np.float32)
+            self._set_embeddings(embeddings)
+            self._rebuild_index()
         
         logger.info(f"Loaded vector store from {path} with {len(self.metadata)} chunks")
     
+    def _mmap_io_flags(self, index_path: str) -> int:
+        """Read-only mmap flags matching the index type stored in index_path"""
+        with open(index_path, "rb") as index_file:
+            fourcc = index_file.read(4)
+        if fourcc in _FLAT_CODES_FOURCCS:
+            return self.faiss.IO_FLAG_MMAP_IFC | self.faiss.IO_FLAG_READ_ONLY
+        return self.faiss.IO_FLAG_MMAP | self.faiss.IO_FLAG_READ_ONLY
+    
+    def _set_embeddings(self, embeddings: np.ndarray) -> None:
+        """Replace stored embeddings with float32 vectors, quantizing if enabled"""
+        if self.quantize:
+            self.embeddings, self.embedding_scales = quantize_int8(embeddings)
+        else:
+            self.embeddings = embeddings
+            self.embedding_scales = np.empty((0, 1), dtype=np.float16)
+    
     def get_size(self) -> int:
         """Get number of documents in store"""
         return len(self.metadata)
@@ -172,6 +416,10 @@ class FAISSVectorStore(VectorStore):
     def get_all_documents(self) -> List[Dict]:
         """Get all document metadata"""
         return [asdict(m) for m in self.metadata]
+    
+    def get_source_files(self) -> List[str]:
+        """Unique source files, in insertion order, without copying chunk metadata"""
+        return list(dict.fromkeys(m.source_file for m in self.metadata))
 
 
 class VectorStoreManager:
@@ -181,21 +429,50 @@ class VectorStoreManager:
         """Initialize vector store manager"""
         self.vector_store = FAISSVectorStore(dimension=dimension)
         self.vector_store_path = vector_store_path or settings.vector_store_path
+        # Path and index mtime of the files the in-memory store matches (set on load and save)
+        self._loaded_path: Optional[str] = None
+        self._loaded_mtime: Optional[int] = None
+        # The manager is shared across Streamlit sessions (threads): never load while saving
+        self._lock = threading.RLock()
         
-        # Load existing store if it exists
+        # Load existing store if it exists (memory-mapped, pages fault in on first search)
         if os.path.exists(self.vector_store_path):
-            self.vector_store.load(self.vector_store_path)
+            self.load(self.vector_store_path, mmap=True)
     
-    def add_chunks(self, chunks: List[TextChunk], embeddings: List[List[float]]) -> None:
-        """Add chunks to vector store"""
-        self.vector_store.add_documents(chunks, embeddings)
-        # Auto-save after adding
-        self.save()
+    def add_chunks(self, chunks: List[TextChunk], embeddings: List[List[float]], save: bool = True) -> None:
+        """Add chunks to vector store (save=False defers persistence to the caller)"""
+        with self._lock:
+            self.vector_store.add_documents(chunks, embeddings)
+            # Auto-save after adding
+            if save:
+                self.save()
     
-    def search(self, query_embedding: List[float], top_k: int = 5) -> List[Dict]:
+    def search(
+        self,
+        query_embedding: List[float],
+        top_k: int = 5,
+        min_similarity: float = None
+    ) -> List[Dict]:
         """Search vector store"""
-        results = self.vector_store.search(query_embedding, top_k)
-        
+        results = self.vector_store.search(query_embedding, top_k, min_similarity)
+        return self._with_metadata(results)
+    
+    def batch_search(
+        self,
+        query_embeddings: List[List[float]],
+        top_k: int = 5,
+        min_similarity: float = None
+    ) -> List[List[Dict]]:
+        """Search vector store for several queries at once"""
+        batch_results = self.vector_store.batch_search(query_embeddings, top_k, min_similarity)
+        return [self._with_metadata(results) for results in batch_results]
+    
+    def get_chunk_by_id(self, chunk_id: str) -> Optional[Dict]:
+        """Get stored chunk metadata and content by ID"""
+        return self.vector_store.get_chunk_by_id(chunk_id)
+    
+    def _with_metadata(self, results: List[Tuple[str, float]]) -> List[Dict]:
+        """Attach chunk metadata to (chunk_id, similarity) search results"""
         detailed_results = []
         for chunk_id, similarity in results:
             metadata = self.vector_store.get_chunk_by_id(chunk_id)
@@ -205,39 +482,76 @@ class VectorStoreManager:
         
         return detailed_results
     
-    def save(self) -> None:
+    @staticmethod
+    def _index_mtime(path: str) -> Optional[int]:
+        """Modification time of the persisted FAISS index, or None if there is none"""
+        index_path = os.path.join(path, "faiss.index")
+        return os.stat(index_path).st_mtime_ns if os.path.exists(index_path) else None
+    
+    def save(self, path: str = None) -> None:
         """Save vector store"""
-        self.vector_store.save(self.vector_store_path)
+        path = path or self.vector_store_path
+        with self._lock:
+            self.vector_store.save(path)
+            self._loaded_path, self._loaded_mtime = path, self._index_mtime(path)
+    
+    def load(self, path: str = None, mmap: bool = True, force: bool = False) -> bool:
+        """Load vector store unless nothing is persisted or it is unchanged since the last load/save
+        
+        Returns True if the store was (re)loaded.
+        """
+        path = path or self.vector_store_path
+        with self._lock:
+            mtime = self._index_mtime(path)
+            if not force and (mtime is None or (path, mtime) == (self._loaded_path, self._loaded_mtime)):
+                logger.debug("No new vector store at %s, skipping load", path)
+                return False
+            
+            self.vector_store.load(path, mmap=mmap)
+            self._loaded_path, self._loaded_mtime = path, mtime
+            return True
     
-    def load(self) -> None:
-        """Load vector store"""
-        self.vector_store.load(self.vector_store_path)
+    def is_ingested(self, file_hash: str) -> bool:
+        """Whether a file with this content hash is already indexed"""
+        return file_hash in self.vector_store.ingested_files
+    
+    def register_ingested_file(self, file_hash: str, source_file: str, chunk_count: int) -> None:
+        """Record an indexed file so identical re-uploads can be skipped (persisted on save)"""
+        self.vector_store.ingested_files[file_hash] = {
+            "source_file": source_file,
+            "chunk_count": chunk_count,
+            "ts": time.time(),
+        }
+    
+    def count(self) -> int:
+        """Number of chunks in the store (O(1), unlike get_statistics)"""
+        return self.vector_store.get_size()
     
     def get_statistics(self) -> Dict:
         """Get vector store statistics"""
-        documents = self.vector_store.get_all_documents()
-        
         # Count unique source files
-        source_files = set(doc['source_file'] for doc in documents)
+        source_files = self.vector_store.get_source_files()
         
         return {
             "total_chunks": self.vector_store.get_size(),
             "unique_documents": len(source_files),
-            "document_files": list(source_files),
+            "document_files": source_files,
             "dimension": self.vector_store.dimension,
         }
     
     def clear(self, uploads_dir: str = None) -> None:
         """Clear all documents from the vector store and optionally uploaded files"""
-        # Reset the vector store
-        dimension = self.vector_store.dimension
-        self.vector_store = FAISSVectorStore(dimension=dimension)
-        
-        # Delete persisted files
         import shutil
-        if os.path.exists(self.vector_store_path):
-            shutil.rmtree(self.vector_store_path)
-            os.makedirs(self.vector_store_path, exist_ok=True)
+        with self._lock:
+            # Reset the vector store
+            dimension = self.vector_store.dimension
+            self.vector_store = FAISSVectorStore(dimension=dimension)
+            self._loaded_path, self._loaded_mtime = None, None
+            
+            # Delete persisted files
+            if os.path.exists(self.vector_store_path):
+                shutil.rmtree(self.vector_store_path)
+                os.makedirs(self.vector_store_path, exist_ok=True)
         
         # Delete uploaded files if uploads_dir is provided
         if uploads_dir and os.path.exists(uploads_dir):
@@ -249,11 +563,11 @@ class VectorStoreManager:
                     if os.path.isfile(file_path):
                         os.unlink(file_path)
                         deleted_count += 1
-                        logger.info(f"Deleted file: {file_path}")
+                        logger.info("Deleted file: %s", file_path)
                     elif os.path.isdir(file_path):
                         shutil.rmtree(file_path)
                         deleted_count += 1
-                        logger.info(f"Deleted directory: {file_path}")
+                        logger.info("Deleted directory: %s", file_path)
                 except Exception as e:
                     error_count += 1
                     logger.error(f"Error deleting {file_path}: {e}")
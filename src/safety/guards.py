@@ -16,6 +16,8 @@ class InputValidator:
         r"javascript:",    # JavaScript injection
         r"\${.*}",         # Template injection
     ]
+    # All patterns compiled once into a single alternation, so each query is scanned in one pass
+    SUSPICIOUS_REGEX = re.compile("|".join(f"(?:{p})" for p in SUSPICIOUS_PATTERNS), re.IGNORECASE)
     
     # Maximum lengths
     MAX_QUERY_LENGTH = 5000
@@ -34,10 +36,8 @@ class InputValidator:
             return False, f"Query exceeds maximum length of {InputValidator.MAX_QUERY_LENGTH} characters"
         
         # Check for suspicious patterns (case-insensitive)
-        query_upper = query.upper()
-        for pattern in InputValidator.SUSPICIOUS_PATTERNS:
-            if re.search(pattern, query_upper, re.IGNORECASE):
-                return False, "Query contains suspicious patterns"
+        if InputValidator.SUSPICIOUS_REGEX.search(query):
+            return False, "Query contains suspicious patterns"
         
         return True, None
     
@@ -59,6 +59,16 @@ class InputValidator:
 class HallucinationDetector:
     """Detect potential hallucinations in responses"""
     
+    CITATION_REGEX = re.compile(
+        "|".join([
+            r"\(.*?source.*?\)",
+            r"\[.*?\d+.*?\]",
+            r"according to.*?:",
+            r"as mentioned in"
+        ]),
+        re.IGNORECASE
+    )
+    
     @staticmethod
     def detect_unsupported_claims(response: str, retrieved_docs: List[Dict]) -> Dict:
         """Detect claims not supported by retrieved documents"""
@@ -102,18 +112,7 @@ class HallucinationDetector:
     def check_citations(response: str, retrieved_docs: List[Dict]) -> Dict:
         """Check if response properly cites sources"""
         
-        citation_patterns = [
-            r"\(.*?source.*?\)",
-            r"\[.*?\d+.*?\]",
-            r"according to.*?:",
-            r"as mentioned in"
-        ]
-        
-        has_citations = False
-        for pattern in citation_patterns:
-            if re.search(pattern, response, re.IGNORECASE):
-                has_citations = True
-                break
+        has_citations = HallucinationDetector.CITATION_REGEX.search(response) is not None
         
         return {
             "has_citations": has_citations,
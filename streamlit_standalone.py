@@ -3,27 +3,43 @@ Standalone Streamlit AI Agent RAG System
 All functionality runs locally - no external API required
 """
 import os
-import sys
+import hashlib
 import tempfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
+import numpy as np
 import streamlit as st
 
-# Add project root to Python path
-project_root = Path(__file__).parent
-sys.path.insert(0, str(project_root))
-
 # Import RAG components
 from src.config.logger import setup_logger
 from src.config.settings import settings
-from src.document_processor.processor import DocumentProcessorFactory
-from src.document_processor.chunker import TextChunker
-from src.embeddings.embedding import EmbeddingManager
+from src.document_processor.processor import parse_and_chunk
+from src.embeddings.embedding import get_embedding_manager
 from src.retrieval.vector_store import VectorStoreManager
 from src.rag.pipeline import RAGPipeline
+from src.rag.query_cache import QueryCache
 from src.agents.agent import AIAgent
 
 logger = setup_logger(__name__)
 
+# Persisted vector store location (shared by load and save)
+VECTOR_STORE_PATH = settings.data_path / "vector_store"
+
+# Parsed chunks accumulated across files before each batched embedding call
+EMBED_FLUSH_CHUNKS = 512
+
+# Block size for copying uploads to temp files
+UPLOAD_COPY_BLOCK_SIZE = 1 << 20  # 1 MB
+
+# Conversation memory limits
+MAX_CHAT_HISTORY = 50  # Oldest messages are dropped beyond this
+MAX_CHARS_PER_MEMORY_MESSAGE = 600  # Truncation applied to each message used as context
+MEMORY_VERBATIM_MESSAGES = 4  # Newest messages (2 turns) always kept verbatim
+SUMMARY_REFRESH_MESSAGES = 4  # Older messages accumulated before folding them into the summary
+# Upper bound on unsummarized messages used as context (everything not yet in the summary fits)
+MAX_MEMORY_MESSAGES = MEMORY_VERBATIM_MESSAGES + SUMMARY_REFRESH_MESSAGES
+
 # Configure Streamlit page
 st.set_page_config(
     page_title="AI Agent RAG System",
@@ -51,14 +67,43 @@ if "previous_model" not in st.session_state:
 if "vector_store_reset" not in st.session_state:
     st.session_state["vector_store_reset"] = False  # Track if vector store was reset on init
 if "chat_history" not in st.session_state:
-    st.session_state["chat_history"] = []  # Sequential chat flow
+    st.session_state["chat_history"] = deque(maxlen=MAX_CHAT_HISTORY)  # Sequential chat flow
 if "conversation_memory_enabled" not in st.session_state:
     st.session_state["conversation_memory_enabled"] = True  # Toggle ON/OFF (default ON)
+if "history_summary" not in st.session_state:
+    st.session_state["history_summary"] = ""  # Running summary of older chat turns
+if "message_seq" not in st.session_state:
+    st.session_state["message_seq"] = 0  # Sequence number assigned to each chat message
+if "summarized_through" not in st.session_state:
+    st.session_state["summarized_through"] = -1  # Last message sequence folded into the summary
+if "vector_store_version" not in st.session_state:
+    st.session_state["vector_store_version"] = 0  # Bumped on every vector store mutation
+if "query_cache" not in st.session_state:
+    st.session_state["query_cache"] = QueryCache()  # Answers to repeated / near-duplicate questions
+
+
+@st.cache_resource(show_spinner=False)
+def _load_embedding_manager():
+    """Load the embedding model once per process, independent of API key and LLM model"""
+    embedding_manager = get_embedding_manager(use_openai=False)
+    # Pay lazy kernel/tokenizer initialization here, under the startup spinner, not on the first question
+    embedding_manager.warm_up()
+    return embedding_manager
+
+
+@st.cache_resource(show_spinner=False)
+def _load_vector_store(path: str, dimension: int):
+    """Load the persisted vector store once per process"""
+    return VectorStoreManager(dimension=dimension, vector_store_path=path)
 
 
 @st.cache_resource(show_spinner=False)
 def initialize_pipeline(groq_api_key: str, model_name: str = "llama-3.3-70b-versatile"):
-    """Initialize RAG pipeline (cached for performance)"""
+    """Initialize RAG pipeline (cached for performance)
+
+    Only the LLM client depends on the API key and model; the embedding model
+    and vector store are separately cached and shared between pipelines.
+    """
     try:
         # Set API key in environment
         os.environ["OPENAI_API_KEY"] = groq_api_key
@@ -69,10 +114,15 @@ def initialize_pipeline(groq_api_key: str, model_name: str = "llama-3.3-70b-vers
         settings.groq_api_key = groq_api_key
         settings.llm_model = model_name
         
-        # Initialize pipeline
-        pipeline = RAGPipeline(use_openai_embeddings=False)
-        
-        # Don't load existing vector store - will be reset on page load
+        # Initialize pipeline around the shared heavy components
+        embedding_manager = _load_embedding_manager()
+        vector_store_manager = _load_vector_store(
+            str(VECTOR_STORE_PATH), embedding_manager.get_dimension()
+        )
+        pipeline = RAGPipeline(
+            embedding_manager=embedding_manager,
+            vector_store_manager=vector_store_manager
+        )
         
         return pipeline
     except Exception as e:
@@ -81,55 +131,42 @@ def initialize_pipeline(groq_api_key: str, model_name: str = "llama-3.3-70b-vers
         return None
 
 
-def process_uploaded_file(uploaded_file, pipeline: RAGPipeline):
-    """Process an uploaded file and add to vector store"""
-    try:
-        # Save uploaded file to temporary location
-        with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as tmp_file:
-            tmp_file.write(uploaded_file.getvalue())
-            tmp_path = tmp_file.name
-        
-        try:
-            # Get appropriate processor for file extension
-            file_extension = Path(uploaded_file.name).suffix.lower().strip('.')
-            processor = DocumentProcessorFactory.get_processor(file_extension)
-            
-            # Extract text
-            text_content = processor.process(tmp_path)
-            
-            # Chunk the text
-            chunker = TextChunker(
-                chunk_size=settings.chunk_size,
-                chunk_overlap=settings.chunk_overlap
-            )
-            chunks = chunker.chunk_text(text_content, source_file=uploaded_file.name)
-            
-            # Generate embeddings
-            embeddings = [
-                pipeline.embedding_manager.embed_text(chunk.content)
-                for chunk in chunks
-            ]
-            
-            # Add to vector store
-            pipeline.vector_store_manager.add_chunks(chunks, embeddings)
-            
-            return True, len(chunks), None
-        
-        finally:
-            # Clean up temp file
-            if os.path.exists(tmp_path):
-                os.unlink(tmp_path)
-    
-    except Exception as e:
-        logger.error(f"Error processing file {uploaded_file.name}: {str(e)}")
-        return False, 0, str(e)
+def save_upload_to_temp(uploaded_file) -> tuple:
+    """Save an uploaded file to a temporary location and return (path, content hash)"""
+    file_hash = hashlib.blake2b(digest_size=32)
+    with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as tmp_file:
+        # Copy in fixed-size blocks instead of materializing a second full copy via getvalue()
+        uploaded_file.seek(0)
+        for block in iter(lambda: uploaded_file.read(UPLOAD_COPY_BLOCK_SIZE), b""):
+            tmp_file.write(block)
+            file_hash.update(block)
+        return tmp_file.name, file_hash.hexdigest()
+
+
+@st.cache_resource(show_spinner=False)
+def _get_parse_pool():
+    """Worker threads for parsing and chunking uploads.
 
+    Not a process pool: Streamlit exposes this script as ``__main__``, so spawned
+    workers would re-run the whole app (model load, pipeline init, store reset).
+    """
+    return ThreadPoolExecutor(max_workers=min(8, os.cpu_count() or 1), thread_name_prefix="parse")
 
-def get_vector_store_stats(pipeline: RAGPipeline):
-    """Get statistics about the vector store"""
+
+def embed_chunks(chunks: list, pipeline: RAGPipeline):
+    """Generate an (N, d) float32 embedding matrix for chunks in batched forward passes"""
+    return pipeline.embedding_manager.embed_texts(
+        [chunk.content for chunk in chunks],
+        batch_size=32
+    )
+
+
+@st.cache_data(ttl=2, show_spinner=False)
+def get_vector_store_stats(_pipeline: RAGPipeline, version: int):
+    """Get statistics about the vector store (cached per store version)"""
     try:
-        stats = pipeline.vector_store_manager.get_statistics()
-        return {"total_chunks": stats.get("total_chunks", 0), "status": "ok"}
+        # Only the chunk count is shown; get_statistics would copy every chunk's metadata
+        return {"total_chunks": _pipeline.vector_store_manager.count(), "status": "ok"}
     except:
         return {"total_chunks": 0, "status": "empty"}
 
@@ -142,17 +179,58 @@ def reset_vector_store(pipeline: RAGPipeline):
         
         # Clear vector store (this also handles file deletion)
         pipeline.vector_store_manager.clear(uploads_dir=uploads_dir)
+        st.session_state["vector_store_version"] += 1
         
         return True, None
     except Exception as e:
         return False, str(e)
 
 
+def slim_retrieved_docs(retrieved_docs: list) -> list:
+    """Keep only what the chat needs to label retrieved chunks; text is fetched on demand."""
+    return [
+        {
+            "chunk_id": doc.get("chunk_id"),
+            "source_file": doc.get("source_file", "Unknown"),
+            "chunk_index": doc.get("chunk_index", 0),
+            "total_chunks": doc.get("total_chunks", 0),
+            "similarity": doc.get("similarity", 0),
+        }
+        for doc in retrieved_docs
+    ]
+
+
+def render_retrieved_docs(retrieved_docs: list, message_seq: int):
+    """Render retrieved documents for an assistant message, built only when toggled open."""
+    if not st.toggle("📚 Retrieved Documents", key=f"show_docs_{message_seq}"):
+        return
+
+    if not retrieved_docs:
+        st.info("No relevant documents found.")
+        return
+
+    vector_store_manager = st.session_state["pipeline"].vector_store_manager
+    for idx, doc in enumerate(retrieved_docs, 1):
+        similarity = doc.get('similarity', 0)
+        source = doc.get('source_file', 'Unknown')
+        chunk_index = doc.get('chunk_index', 0)
+        total_chunks = doc.get('total_chunks', 0)
+        chunk = vector_store_manager.get_chunk_by_id(doc.get('chunk_id'))
+        content = chunk["content"] if chunk else "This chunk is no longer in the vector store."
+
+        with st.expander(f"📄 Document {idx}: {source} (chunk {chunk_index}/{total_chunks}) - Similarity: {similarity:.3f}"):
+            st.text(content)
+
+
 def render_chat_history():
-    """Render chat messages in sequential conversation flow."""
+    """Render chat messages in sequential conversation flow.
+
+    Returns the intro placeholder and a container placed after the history,
+    so new messages can be appended in place without a rerun.
+    """
+    intro = st.empty()
     if not st.session_state["chat_history"]:
-        st.info("💬 Start the conversation by asking a question below.")
-        return
+        intro.info("💬 Start the conversation by asking a question below.")
 
     for message in st.session_state["chat_history"]:
         role = message.get("role", "assistant")
@@ -161,46 +239,108 @@ def render_chat_history():
         with st.chat_message(role):
             st.markdown(content)
 
-            retrieved_docs = message.get("retrieved_docs", [])
-            show_details = message.get("show_details", False)
+            if role == "assistant" and message.get("show_details", False):
+                render_retrieved_docs(message.get("retrieved_docs", []), message.get("_seq", -1))
 
-            if role == "assistant" and show_details:
-                with st.expander("📚 Retrieved Documents", expanded=False):
-                    if not retrieved_docs:
-                        st.info("No relevant documents found.")
-                    else:
-                        for idx, doc in enumerate(retrieved_docs, 1):
-                            similarity = doc.get('similarity', 0)
-                            source = doc.get('source_file', 'Unknown')
-                            chunk_index = doc.get('chunk_index', 0)
-                            total_chunks = doc.get('total_chunks', 0)
-                            content = doc.get('content', '')
+    return intro, st.container()
 
-                            with st.expander(f"📄 Document {idx}: {source} (chunk {chunk_index}/{total_chunks}) - Similarity: {similarity:.3f}"):
-                                st.text(content)
 
+def clear_chat():
+    """Clear the conversation (button callback, runs before the next script run)."""
+    st.session_state["query_input"] = ""
+    reset_chat_history()
+    st.session_state["widget_refresh_counter"] += 1  # Force widget recreation
 
-def build_contextual_query(current_query: str, max_messages: int = 6, max_chars_per_message: int = 600) -> str:
-    """Build query with recent chat context when memory is enabled."""
-    if not st.session_state.get("conversation_memory_enabled", False):
-        return current_query
 
-    history = st.session_state.get("chat_history", [])
-    if not history:
-        return current_query
+def format_memory_line(role: str, content: str) -> str:
+    """Format a chat message once for reuse as conversation memory context."""
+    content = (content or "").strip()
+    if not content:
+        return ""
+    if len(content) > MAX_CHARS_PER_MEMORY_MESSAGE:
+        content = content[:MAX_CHARS_PER_MEMORY_MESSAGE] + "..."
+    speaker = "User" if role == "user" else "Assistant"
+    return f"{speaker}: {content}"
+
 
-    recent_messages = history[-max_messages:]
-    formatted_history = []
+def append_chat_message(message: dict):
+    """Append a message to the bounded chat history with its memory line precomputed."""
+    message["_formatted"] = format_memory_line(message.get("role"), message.get("content"))
+    message["_seq"] = st.session_state["message_seq"]
+    st.session_state["message_seq"] += 1
+    st.session_state["chat_history"].append(message)
 
-    for msg in recent_messages:
-        role = "User" if msg.get("role") == "user" else "Assistant"
-        content = (msg.get("content") or "").strip()
-        if not content:
-            continue
-        if len(content) > max_chars_per_message:
-            content = content[:max_chars_per_message] + "..."
-        formatted_history.append(f"{role}: {content}")
 
+def reset_chat_history():
+    """Clear the chat history and its running summary."""
+    st.session_state["chat_history"].clear()
+    st.session_state["history_summary"] = ""
+    st.session_state["summarized_through"] = st.session_state["message_seq"] - 1
+
+
+@st.cache_data(show_spinner=False)
+def summarize_conversation(_pipeline: RAGPipeline, previous_summary: str, lines: tuple) -> str:
+    """Fold older chat turns into the running summary (cached on the summarized content)."""
+    summary_prompt = (
+        "Summarize this conversation in at most 120 words. Keep names, facts, "
+        "and open questions that later turns may refer to."
+    )
+    conversation = "\n".join(lines)
+    if previous_summary:
+        conversation = f"Earlier summary: {previous_summary}\n{conversation}"
+
+    messages = [
+        _pipeline.SystemMessage(content=summary_prompt),
+        _pipeline.HumanMessage(content=conversation)
+    ]
+    return _pipeline.llm.invoke(messages).content.strip()
+
+
+def refresh_history_summary(pipeline: RAGPipeline):
+    """Summarize messages that left the verbatim window once enough have accumulated."""
+    history = list(st.session_state["chat_history"])
+    older = [
+        msg for msg in history[:-MEMORY_VERBATIM_MESSAGES]
+        if msg.get("_seq", -1) > st.session_state["summarized_through"]
+    ]
+    if len(older) < SUMMARY_REFRESH_MESSAGES:
+        return
+
+    lines = tuple(msg["_formatted"] for msg in older if msg.get("_formatted"))
+    try:
+        st.session_state["history_summary"] = summarize_conversation(
+            pipeline, st.session_state["history_summary"], lines
+        )
+        st.session_state["summarized_through"] = older[-1]["_seq"]
+    except Exception as e:
+        logger.warning(f"Could not summarize conversation history: {e}")
+
+
+def get_recent_history_lines(max_messages: int = MAX_MEMORY_MESSAGES) -> list:
+    """Return the running summary plus memory lines for messages not yet summarized."""
+    lines = []
+    summary = st.session_state.get("history_summary")
+    if summary:
+        lines.append(f"Summary of earlier conversation: {summary}")
+
+    history = st.session_state.get("chat_history")
+    if history:
+        summarized_through = st.session_state.get("summarized_through", -1)
+        # Filter before capping so no message falls between the summary and the window
+        recent_messages = [
+            msg for msg in history
+            if msg.get("_seq", -1) > summarized_through
+        ][-max_messages:]
+        lines.extend(msg["_formatted"] for msg in recent_messages if msg.get("_formatted"))
+    return lines
+
+
+def build_contextual_query(current_query: str, max_messages: int = MAX_MEMORY_MESSAGES) -> str:
+    """Build query with recent chat context when memory is enabled."""
+    if not st.session_state.get("conversation_memory_enabled", False):
+        return current_query
+
+    formatted_history = get_recent_history_lines(max_messages)
     if not formatted_history:
         return current_query
 
@@ -213,7 +353,7 @@ def build_contextual_query(current_query: str, max_messages: int = 6, max_chars_
     )
 
 
-def build_rag_system_prompt(max_messages: int = 6, max_chars_per_message: int = 600) -> str:
+def build_rag_system_prompt(max_messages: int = MAX_MEMORY_MESSAGES) -> str:
     """Build RAG system prompt with optional conversation memory context."""
     base_prompt = """You are an intelligent assistant that answers questions based on provided documents.
             
@@ -226,22 +366,7 @@ def build_rag_system_prompt(max_messages: int = 6, max_chars_per_message: int =
     if not st.session_state.get("conversation_memory_enabled", False):
         return base_prompt
 
-    history = st.session_state.get("chat_history", [])
-    if not history:
-        return base_prompt
-
-    recent_messages = history[-max_messages:]
-    formatted_history = []
-
-    for msg in recent_messages:
-        role = "User" if msg.get("role") == "user" else "Assistant"
-        content = (msg.get("content") or "").strip()
-        if not content:
-            continue
-        if len(content) > max_chars_per_message:
-            content = content[:max_chars_per_message] + "..."
-        formatted_history.append(f"{role}: {content}")
-
+    formatted_history = get_recent_history_lines(max_messages)
     if not formatted_history:
         return base_prompt
 
@@ -332,6 +457,7 @@ with st.sidebar:
             if not st.session_state["vector_store_reset"]:
                 try:
                     st.session_state["pipeline"].vector_store_manager.clear()
+                    st.session_state["vector_store_version"] += 1
                     st.session_state["uploaded_files_info"] = []
                     st.session_state["user_decision_made"] = False
                     st.session_state["vector_store_reset"] = True
@@ -339,8 +465,14 @@ with st.sidebar:
                 except Exception as e:
                     logger.warning(f"Could not reset vector store: {e}")
             
+            # Pick up a store saved by another process; a single stat() when nothing changed
+            if st.session_state["pipeline"].vector_store_manager.load():
+                st.session_state["vector_store_version"] += 1
+            
             # Show vector store stats
-            stats = get_vector_store_stats(st.session_state["pipeline"])
+            stats = get_vector_store_stats(
+                st.session_state["pipeline"], st.session_state["vector_store_version"]
+            )
             st.metric("Documents in Store", stats["total_chunks"])
     else:
         st.warning("⚠️ Please enter your Groq API key to continue")
@@ -379,7 +511,7 @@ if st.session_state["previous_query_mode"] != query_mode:
         st.session_state["user_decision_made"] = False
     # Reset query input and increment widget counter when switching modes
     st.session_state["query_input"] = ""
-    st.session_state["chat_history"] = []
+    reset_chat_history()
     st.session_state["widget_refresh_counter"] += 1
     st.session_state["previous_query_mode"] = query_mode
 
@@ -388,6 +520,26 @@ if show_upload:
     st.divider()
     st.subheader("2️⃣ Upload(s)")
     
+    # Celebrate a finished upload from the previous run
+    upload_complete_message = st.session_state.pop("upload_complete_message", None)
+    if upload_complete_message:
+        st.balloons()
+        st.toast(upload_complete_message)
+    
+    # Or report why the previous upload did not (fully) succeed
+    upload_problem = st.session_state.pop("upload_problem", None)
+    if upload_problem:
+        level, message = upload_problem
+        (st.error if level == "error" else st.warning)(message)
+    
+    # Per-file results of the previous upload (its status panel is gone after the rerun)
+    failed_files = st.session_state.pop("upload_failed_files", [])
+    skipped_files = st.session_state.pop("upload_skipped_files", [])
+    for name, error in failed_files:
+        st.error(f"❌ {name} - Error: {error}")
+    if skipped_files:
+        st.info(f"⏭️ Skipped duplicates: {', '.join(skipped_files)}")
+    
     # Check if there are previously uploaded files and user hasn't decided yet
     has_previous_files = len(st.session_state["uploaded_files_info"]) > 0
     
@@ -464,53 +616,130 @@ Supported formats: PDF, TXT, CSV, XLSX, DOCX
             st.warning("⚠️ Please select one or more files to upload.")
         else:
             progress_bar = st.progress(0)
-            status_text = st.empty()
-            
             total_files = len(uploaded_files)
+            # Per-file results collect in one collapsible status panel while workers parse
+            ingest_status = st.status(f"Processing {total_files} files...", expanded=True)
             total_chunks = 0
+            all_chunks = []
+            all_embeddings = []
+            pending_chunks = []
+            processed_files = []
+            failed_files = []  # (name, error)
+            skipped_files = []
+            indexing_error = None
+            tmp_paths = []
             
-            for idx, uploaded_file in enumerate(uploaded_files):
-                status_text.text(f"Processing: {uploaded_file.name}...")
+            try:
+                # Parse and chunk all files concurrently in worker threads
+                parse_pool = _get_parse_pool()
+                futures = {}
+                submitted_hashes = set()
+                for uploaded_file in uploaded_files:
+                    tmp_path, file_hash = save_upload_to_temp(uploaded_file)
+                    tmp_paths.append(tmp_path)
+                    
+                    # Identical content is already indexed (or queued in this batch): skip all work
+                    if pipeline.vector_store_manager.is_ingested(file_hash) or file_hash in submitted_hashes:
+                        ingest_status.write(f"⏭️ {uploaded_file.name} - duplicate (skipped)")
+                        skipped_files.append(uploaded_file.name)
+                        continue
+                    submitted_hashes.add(file_hash)
+                    
+                    future = parse_pool.submit(
+                        parse_and_chunk, tmp_path, uploaded_file.name,
+                        settings.chunk_size, settings.chunk_overlap
+                    )
+                    futures[future] = (uploaded_file, file_hash)
                 
-                success, chunks, error = process_uploaded_file(uploaded_file, pipeline)
+                # Embed in large batches as parsed files come back
+                for done, future in enumerate(as_completed(futures), 1):
+                    uploaded_file, file_hash = futures[future]
+                    try:
+                        chunks = future.result()
+                        ingest_status.write(f"✅ {uploaded_file.name} - {len(chunks)} chunks processed")
+                        pending_chunks.extend(chunks)
+                        processed_files.append({
+                            "name": uploaded_file.name,
+                            "chunks": len(chunks),
+                            "size": uploaded_file.size,
+                            "hash": file_hash
+                        })
+                    except Exception as e:
+                        logger.error(f"Error processing file {uploaded_file.name}: {str(e)}")
+                        ingest_status.write(f"❌ {uploaded_file.name} - Error: {e}")
+                        failed_files.append((uploaded_file.name, str(e)))
+                    
+                    if len(pending_chunks) >= EMBED_FLUSH_CHUNKS or (done == len(futures) and pending_chunks):
+                        ingest_status.update(label=f"Embedding {len(pending_chunks)} chunks...")
+                        all_embeddings.append(embed_chunks(pending_chunks, pipeline))
+                        all_chunks.extend(pending_chunks)
+                        pending_chunks = []
+                    
+                    progress_bar.progress(done / len(futures))
                 
-                if success:
-                    st.success(f"✅ {uploaded_file.name} - {chunks} chunks indexed")
-                    total_chunks += chunks
+                # Index every file's chunks in one batch, then persist once
+                if all_chunks:
+                    ingest_status.update(label=f"Indexing {len(all_chunks)} chunks...")
+                    embeddings = all_embeddings[0] if len(all_embeddings) == 1 else np.vstack(all_embeddings)
+                    pipeline.vector_store_manager.add_chunks(all_chunks, embeddings, save=False)
+                    total_chunks = len(all_chunks)
                     
                     # Store uploaded file info in session state
-                    file_info = {
-                        "name": uploaded_file.name,
-                        "chunks": chunks,
-                        "size": uploaded_file.size
-                    }
-                    # Check if file already exists in the list (avoid duplicates)
                     existing_names = [f["name"] for f in st.session_state["uploaded_files_info"]]
-                    if uploaded_file.name not in existing_names:
-                        st.session_state["uploaded_files_info"].append(file_info)
-                else:
-                    st.error(f"❌ {uploaded_file.name} - Error: {error}")
-                
-                progress_bar.progress((idx + 1) / total_files)
+                    for file_info in processed_files:
+                        pipeline.vector_store_manager.register_ingested_file(
+                            file_info.pop("hash"), file_info["name"], file_info["chunks"]
+                        )
+                        # Check if file already exists in the list (avoid duplicates)
+                        if file_info["name"] not in existing_names:
+                            st.session_state["uploaded_files_info"].append(file_info)
+            except Exception as e:
+                indexing_error = str(e)
+                st.error(f"❌ Indexing failed: {e}")
+                ingest_status.update(label="❌ Indexing failed", state="error")
+                logger.error(f"Error indexing uploaded files: {str(e)}")
+            else:
+                ingest_status.update(
+                    label=f"✅ Complete! Indexed {total_chunks} chunks from {total_files} files",
+                    state="complete", expanded=False
+                )
+            finally:
+                # Clean up temp files
+                for tmp_path in tmp_paths:
+                    if os.path.exists(tmp_path):
+                        os.unlink(tmp_path)
             
-            status_text.text(f"✅ Complete! Indexed {total_chunks} chunks from {total_files} files")
+            st.session_state["vector_store_version"] += 1
             
             # Mark decision as made so prompt doesn't show again until mode switch
             st.session_state["user_decision_made"] = True
             
             # Save vector store to persist changes
-            try:
-                vector_store_path = settings.data_path / "vector_store"
-                pipeline.vector_store_manager.save(str(vector_store_path))
-            except Exception as e:
-                logger.warning(f"Could not save vector store: {e}")
-            
-            # Show success animation
-            st.balloons()
+            if total_chunks:
+                try:
+                    pipeline.vector_store_manager.save(str(VECTOR_STORE_PATH))
+                except Exception as e:
+                    logger.warning(f"Could not save vector store: {e}")
             
-            # Small delay to allow balloons animation before rerun
-            import time
-            time.sleep(1)
+            # Report the outcome on the refreshed page (client-side, no blocking delay);
+            # success is only celebrated when something was indexed and nothing failed
+            if indexing_error:
+                st.session_state["upload_problem"] = ("error", f"❌ Indexing failed: {indexing_error}")
+            elif failed_files:
+                st.session_state["upload_problem"] = (
+                    "warning",
+                    f"⚠️ {len(failed_files)} of {total_files} files failed; indexed {total_chunks} chunks from the rest"
+                )
+            elif not total_chunks:
+                st.session_state["upload_problem"] = (
+                    "warning", "⚠️ No new chunks were indexed (files were empty or already indexed)"
+                )
+            else:
+                st.session_state["upload_complete_message"] = (
+                    f"✅ Complete! Indexed {total_chunks} chunks from {total_files} files"
+                )
+            st.session_state["upload_failed_files"] = failed_files
+            st.session_state["upload_skipped_files"] = skipped_files
             
             # Trigger rerun to refresh the UI and show newly uploaded files in the dropdown
             st.rerun()
@@ -549,12 +778,12 @@ query_step = "3️⃣" if show_upload else "2️⃣"
 st.subheader(f"{query_step} Querying")
 
 st.subheader("💬 Conversation")
-render_chat_history()
+chat_intro, chat_container = render_chat_history()
 
 # Check if documents exist for RAG mode - must be done every time
 has_documents = False
 if show_upload:
-    stats = get_vector_store_stats(pipeline)
+    stats = get_vector_store_stats(pipeline, st.session_state["vector_store_version"])
     total_chunks = stats.get("total_chunks", 0)
     has_documents = total_chunks > 0
     
@@ -590,7 +819,7 @@ with query_col:
     if "query_input" not in st.session_state:
         st.session_state["query_input"] = ""
     
-    with st.form(key=f"query_form_{st.session_state['widget_refresh_counter']}"):
+    with st.form(key=f"query_form_{st.session_state['widget_refresh_counter']}", clear_on_submit=True):
         # Ctrl+Enter submits this form
         query_text = st.text_area(
             "Your question:",
@@ -651,51 +880,92 @@ clear_col, _ = st.columns([1, 1])
 with clear_col:
     # Disable Clear button when in RAG mode with no documents
     clear_button_disabled = show_upload and not has_documents
-    clear_clicked = st.button(
+    st.button(
         "🧹 Clear", 
         use_container_width=True,
         disabled=clear_button_disabled,
-        help="Upload documents first to enable RAG queries" if clear_button_disabled else None
+        help="Upload documents first to enable RAG queries" if clear_button_disabled else None,
+        on_click=clear_chat  # Clears state before the click's own rerun, no extra round-trip
     )
 
-# Handle clear button - clears immediately and forces widget refresh
-if clear_clicked:
-    st.session_state["query_input"] = ""
-    st.session_state["chat_history"] = []
-    st.session_state["widget_refresh_counter"] += 1  # Force widget recreation
-    st.rerun()
-
 # Process query
 if ask_clicked:
     if not query_text.strip():
         st.warning("⚠️ Please enter a question.")
     else:
-        with st.spinner("🤔 Thinking..."):
-            try:
-                query = query_text.strip()
-                contextual_query = build_contextual_query(query)
-                st.session_state["chat_history"].append({
-                    "role": "user",
-                    "content": query
-                })
-                retrieved_docs = []
-                
+        try:
+            query = query_text.strip()
+            contextual_query = build_contextual_query(query)
+            # Answers shaped by earlier turns are not reusable; checked before this message joins the history
+            use_query_cache = not (
+                st.session_state["conversation_memory_enabled"] and get_recent_history_lines()
+            )
+            append_chat_message({
+                "role": "user",
+                "content": query
+            })
+            chat_intro.empty()
+            with chat_container:
+                with st.chat_message("user"):
+                    st.markdown(query)
+
+            retrieved_docs = []
+            response_stream = None
+            cache_context = None
+            cache_hit = False
+            answer_ok = True  # Failed agent runs must not be cached
+
+            with st.spinner("🤔 Thinking..."):
                 # Determine if we need RAG
                 if show_upload and has_documents:
                     rag_system_prompt = build_rag_system_prompt()
 
+                    query_embedding = None
+                    cached = None
+                    if use_query_cache:
+                        # Reuse the answer to the same (or a near-identical) question asked under
+                        # the same model, settings and documents, with no prior conversation
+                        query_cache = st.session_state["query_cache"]
+                        cache_context = QueryCache.make_context(
+                            st.session_state["previous_model"],
+                            top_k,
+                            use_agent,
+                            st.session_state["vector_store_version"],
+                            pipeline.vector_store_manager.vector_store.get_size()
+                        )
+                        # Exact repeats are answered before any embedding or network work
+                        cached = query_cache.get(query, cache_context)
+
+                    if cached is None:
+                        # Overlap the LLM's connection setup (DNS, TLS) with query embedding and retrieval
+                        pipeline.start_llm_warm_up()
+                        query_embedding = pipeline.embedding_manager.embed_text(query)
+                        if use_query_cache:
+                            cached = query_cache.get(query, cache_context, query_embedding)
+
                     # RAG Query
-                    if use_agent:
+                    if cached is not None:
+                        response, retrieved_docs = cached
+                        cache_hit = True
+                    elif use_agent:
                         # Use agent for complex queries (handles retrieval internally)
+                        # Multi-part questions retrieve all sub-queries in one batched search
                         agent = AIAgent(pipeline)
-                        result = agent.process_query(query, top_k=top_k, system_prompt=rag_system_prompt)
+                        result = agent.process_query_batched(
+                            query, top_k=top_k, system_prompt=rag_system_prompt,
+                            query_embedding=query_embedding
+                        )
                         response = result.get('response', '')
                         retrieved_docs = result.get('retrieved_docs', [])
+                        answer_ok = result.get('status') == "success"
                     else:
-                        # Standard RAG response
-                        retrieved_docs = pipeline.retrieve(query, top_k=top_k)
-                        response = pipeline.generate_response(query, retrieved_docs, system_prompt=rag_system_prompt)
-                
+                        # Standard RAG response, streamed token by token
+                        # Reuse the embedding computed for the cache probe
+                        retrieved_docs = pipeline.retrieve_with_embedding(query_embedding, top_k=top_k)
+                        response_stream = pipeline.generate_response_stream(
+                            query, retrieved_docs, system_prompt=rag_system_prompt
+                        )
+
                 else:
                     # Direct LLM Query (no RAG)
                     if use_agent:
@@ -718,26 +988,48 @@ if ask_clicked:
                             pipeline.SystemMessage(content=direct_system_prompt),
                             pipeline.HumanMessage(content=contextual_query)
                         ]
-                        response = pipeline.llm.invoke(messages).content
+                        response_stream = (chunk.content for chunk in pipeline.llm.stream(messages))
+
+            # Render the answer in place; streamed tokens appear as they arrive
+            message_show_details = show_details if show_upload else False
+            retrieved_docs = slim_retrieved_docs(retrieved_docs)
+            with chat_container:
+                with st.chat_message("assistant"):
+                    if response_stream is not None:
+                        response = st.write_stream(response_stream)
+                    else:
+                        st.markdown(response)
+                    if message_show_details:
+                        # Same key the history render will use once this message is appended
+                        render_retrieved_docs(retrieved_docs, st.session_state["message_seq"])
 
-                st.session_state["chat_history"].append({
-                    "role": "assistant",
-                    "content": response,
-                    "retrieved_docs": retrieved_docs,
-                    "show_details": show_details if show_upload else False
-                })
+            # Only real answers are cached, so a failed or empty one is retried next time
+            if (
+                cache_context is not None and not cache_hit and answer_ok
+                and isinstance(response, str) and response.strip()
+            ):
+                query_cache.put(query, cache_context, response, retrieved_docs, query_embedding)
 
-                st.session_state["query_input"] = ""
-                st.session_state["widget_refresh_counter"] += 1
-                st.rerun()
-            
-            except Exception as e:
-                st.error(f"❌ Error: {str(e)}")
-                st.session_state["chat_history"].append({
-                    "role": "assistant",
-                    "content": f"❌ Error: {str(e)}"
-                })
-                logger.error(f"Query error: {str(e)}")
+            append_chat_message({
+                "role": "assistant",
+                "content": response,
+                "retrieved_docs": retrieved_docs,
+                "show_details": message_show_details
+            })
+
+            # Fold turns that left the verbatim window into the running summary
+            if st.session_state["conversation_memory_enabled"]:
+                refresh_history_summary(pipeline)
+
+            st.session_state["query_input"] = ""
+        
+        except Exception as e:
+            st.error(f"❌ Error: {str(e)}")
+            append_chat_message({
+                "role": "assistant",
+                "content": f"❌ Error: {str(e)}"
+            })
+            logger.error(f"Query error: {str(e)}")
 
 # Footer
 st.divider()